@@ -0,0 +1,38 @@
+from .aio import AsyncFrequent
+from .checkpoint import Checkpointer
+from .compact import CompactFrequent, bytes_per_counter
+from .engine import Frequent
+from .hierarchy import HierarchicalFrequent, IPv4, Paths
+from .intid import IntFrequent
+from .lazy import LazyFrequent
+from .lossy import LossyCounting
+from .parallel import process_pool, tree_merge
+from .sharded import ShardedFrequent
+from .spacesaving import SpaceSaving
+from .tenants import MultiFrequent
+from .verify import exact_counts, exact_counts_file, heavy_hitters
+from .window import DecayedFrequent, WindowedFrequent
+
+__all__ = [
+    "AsyncFrequent",
+    "Checkpointer",
+    "CompactFrequent",
+    "DecayedFrequent",
+    "Frequent",
+    "HierarchicalFrequent",
+    "IPv4",
+    "IntFrequent",
+    "LazyFrequent",
+    "LossyCounting",
+    "MultiFrequent",
+    "Paths",
+    "ShardedFrequent",
+    "SpaceSaving",
+    "WindowedFrequent",
+    "bytes_per_counter",
+    "exact_counts",
+    "exact_counts_file",
+    "heavy_hitters",
+    "process_pool",
+    "tree_merge",
+]
@@ -0,0 +1,105 @@
+import argparse
+import sys
+
+import numpy as np
+
+from . import bench
+from .compact import CompactFrequent
+from .engine import Frequent
+from .intid import IntFrequent
+from .lazy import LazyFrequent
+from .ingest import CHUNK_BYTES, read_binary, read_lines
+from .verify import exact_counts, exact_counts_file, heavy_hitters
+
+BACKENDS = {"frequent": Frequent, "compact": CompactFrequent, "int": IntFrequent, "lazy": LazyFrequent}
+
+
+def open_input(path):
+    return sys.stdin.buffer if path == "-" else open(path, "rb")
+
+
+def read_batches(source, args):
+    if args.format == "binary":
+        return read_binary(source, args.dtype, args.chunk_bytes)
+    return read_lines(source, args.chunk_bytes, np.int64 if args.format == "ints" else None)
+
+
+def format_item(item):
+    return item.decode(errors="replace") if isinstance(item, bytes) else str(item)
+
+
+def topk(args):
+    if args.verify and args.file == "-":
+        sys.exit("--verify needs a file it can read twice, not stdin")
+    if args.backend == "int" and args.format == "lines":
+        sys.exit("--backend int needs integer IDs: --format ints or binary")
+    summary = BACKENDS[args.backend](args.k)
+    with open_input(args.file) as source:
+        for batch in read_batches(source, args):
+            summary.update_batch(batch)
+    if args.verify:
+        return verify(summary, args)
+    out = sys.stdout
+    out.write("# n=%d k=%d\n" % (summary.n, summary.k))
+    for item, _ in summary.top(summary.k):
+        out.write("%s\t%d\t%d\n" % ((format_item(item),) + summary.estimate(item)))
+
+
+def verify(summary, args):
+    if args.format == "binary" and args.workers != 1:
+        n, counts = exact_counts_file(summary.candidates(), args.file, args.dtype, args.workers)
+    else:
+        with open_input(args.file) as source:
+            n, counts = exact_counts(summary.candidates(), read_batches(source, args))
+    exact = sorted(heavy_hitters(summary.k, n, counts).items(), key=lambda pair: pair[1], reverse=True)
+    out = sys.stdout
+    out.write("# n=%d k=%d verified\n" % (n, summary.k))
+    for item, count in exact:
+        out.write("%s\t%d\n" % (format_item(item), count))
+
+
+def run_bench(args):
+    results = bench.run(args.backends, args.streams, args.k, args.n, seed=args.seed,
+                        latency_samples=args.latency_samples, memory_items=args.memory_items)
+    bench.report(results, sys.stdout)
+    if args.json:
+        bench.dump(results, args.json)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m frequent")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_topk = commands.add_parser("topk", help="print the heavy-hitter candidates of a stream with count bounds")
+    parser_topk.add_argument("file", nargs="?", default="-", help="input file, '-' for stdin (default)")
+    parser_topk.add_argument("--k", type=int, required=True, help="number of counters")
+    parser_topk.add_argument("--format", choices=["lines", "ints", "binary"], default="lines",
+                             help="newline-delimited items, newline-delimited integers, or fixed-width binary IDs")
+    parser_topk.add_argument("--dtype", default="<i8", help="NumPy dtype of binary IDs (default: little-endian int64)")
+    parser_topk.add_argument("--chunk-bytes", type=int, default=CHUNK_BYTES, help="bytes per read or mapped batch")
+    parser_topk.add_argument("--backend", choices=sorted(BACKENDS), default="frequent")
+    parser_topk.add_argument("--verify", action="store_true",
+                             help="re-read the file, count the candidates exactly and print only true heavy hitters")
+    parser_topk.add_argument("--workers", type=int, default=1,
+                             help="processes for the verification pass over binary files (0 = all cores)")
+    parser_topk.set_defaults(func=topk)
+
+    parser_bench = commands.add_parser("bench", help="benchmark the backends on generated streams")
+    parser_bench.add_argument("--n", type=int, default=200000, help="items per stream")
+    parser_bench.add_argument("--k", type=int, nargs="+", default=[10, 1000], help="counter counts to try")
+    parser_bench.add_argument("--streams", nargs="+", choices=sorted(bench.STREAMS), default=sorted(bench.STREAMS))
+    parser_bench.add_argument("--backends", nargs="+", choices=sorted(bench.BACKENDS), default=bench.DEFAULT_BACKENDS)
+    parser_bench.add_argument("--seed", type=int, default=0)
+    parser_bench.add_argument("--latency-samples", type=int, default=100000,
+                              help="per-update timings to collect for p50/p99")
+    parser_bench.add_argument("--memory-items", type=int, default=200000,
+                              help="items fed under tracemalloc to measure peak memory")
+    parser_bench.add_argument("--json", help="also write the results to this JSON file")
+    parser_bench.set_defaults(func=run_bench)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Feed a Frequent summary from asyncio sources in micro-batches."""
+
+import asyncio
+
+from .engine import Frequent
+
+BATCH_SIZE = 4096
+
+
+class AsyncFrequent:
+    """Wraps a summary so coroutines can feed it without starving the event loop.
+
+    Items are applied in micro-batches of at most ``batch_size``; every update
+    is O(1), including the decrement of all counters, so a batch is bounded
+    work and control goes back to the loop between batches. Snapshots are
+    taken between batches, so they are always consistent and never wait for
+    ingestion to stop.
+    """
+
+    def __init__(self, k=None, summary=None, batch_size=BATCH_SIZE):
+        if summary is None:
+            if k is None:
+                raise ValueError("either k or summary is required")
+            summary = Frequent(k)
+        self.summary = summary
+        self.batch_size = batch_size
+
+    def _apply(self, batch):
+        update = self.summary.update
+        for item in batch:
+            update(item)
+
+    async def consume(self, source, stop=None):
+        """Ingest from an async iterator or an ``asyncio.Queue``.
+
+        A queue is read until it yields ``stop``. Returns the number of
+        items ingested.
+        """
+        if isinstance(source, asyncio.Queue):
+            return await self._consume_queue(source, stop)
+        count = 0
+        batch = []
+        async for item in source:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._apply(batch)
+                count += len(batch)
+                batch = []
+                await asyncio.sleep(0)
+        self._apply(batch)
+        return count + len(batch)
+
+    async def _consume_queue(self, queue, stop):
+        count = 0
+        while True:
+            item = await queue.get()
+            batch = []
+            done = item is stop
+            if not done:
+                batch.append(item)
+            while not done and len(batch) < self.batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is stop:
+                    done = True
+                else:
+                    batch.append(item)
+            self._apply(batch)
+            count += len(batch)
+            if done:
+                return count
+            await asyncio.sleep(0)
+
+    async def consume_lines(self, reader):
+        """Ingest newline-delimited items (as bytes) from an ``asyncio.StreamReader``."""
+        count = 0
+        tail = b""
+        while True:
+            chunk = await reader.read(1 << 16)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for start in range(0, len(lines), self.batch_size):
+                batch = [line for line in lines[start:start + self.batch_size] if line]
+                self._apply(batch)
+                count += len(batch)
+                await asyncio.sleep(0)
+        if tail:
+            self._apply([tail])
+            count += 1
+        return count
+
+    async def serve(self, host="127.0.0.1", port=0):
+        """Start a TCP server feeding every connection's lines into the summary."""
+
+        async def handle(reader, writer):
+            try:
+                await self.consume_lines(reader)
+            finally:
+                writer.close()
+
+        return await asyncio.start_server(handle, host, port)
+
+    def snapshot(self):
+        """Current ``(item, count)`` candidates, largest count first.
+
+        The tuple is cached by the summary until its next update, so
+        polling it between batches is cheap.
+        """
+        return self.summary.snapshot()
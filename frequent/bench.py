@@ -0,0 +1,241 @@
+"""Throughput, latency, memory and accuracy benchmarks for the Frequent backends.
+
+Every backend runs on the same generated streams: Zipf-distributed IDs,
+uniform IDs, and an adversarial stream that fills the k counters with large
+counts and then sends only new items, so every element of that tail
+decrements all counters. The proof bounds the decrements by n/(k+1), so the
+naive loop is cheap on average; the tail shows up in its worst-case latency.
+The lazy backend keeps the dictionary but turns each decrement into a raise
+of a global offset, sweeping zeroed counters only when a slot is needed.
+Space-Saving (with the k+1 counters it needs for the same guarantee) and
+Lossy Counting run alongside for comparison. Every backend reports the
+monitored items whose upper bound exceeds n/(k+1), and recall and precision
+of those are measured against the exact items occurring more than n/(k+1)
+times. Memory is reported twice: the peak while ingesting a prefix of each
+stream, and the heap bytes per counter of a summary holding k distinct
+candidates (``compact.bytes_per_counter``), the figure the backends' memory
+claims are stated in. Results are plain dicts that can be dumped as JSON to track
+regressions.
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from .compact import CompactFrequent, bytes_per_counter
+from .engine import Frequent
+from .intid import IntFrequent
+from .lazy import LazyFrequent
+from .lossy import LossyCounting
+from .spacesaving import SpaceSaving
+
+BATCH_SIZE = 1 << 16
+
+
+class NaiveFrequent:
+    """The dictionary pseudocode from the video: O(k) work per decrement."""
+
+    def __init__(self, k):
+        self.k = k
+        self.n = 0
+        self.decrements = 0
+        self.counters = {}
+
+    def update(self, item):
+        self.n += 1
+        counters = self.counters
+        if item in counters:
+            counters[item] += 1
+        elif len(counters) < self.k:
+            counters[item] = 1
+        else:
+            self.decrements += 1
+            for other in list(counters):
+                counters[other] -= 1
+                if not counters[other]:
+                    del counters[other]
+
+    def extend(self, stream):
+        update = self.update
+        for item in stream:
+            update(item)
+
+    def counts(self):
+        return dict(self.counters)
+
+    def estimate(self, item):
+        lower = self.counters.get(item, 0)
+        return lower, lower + self.decrements
+
+
+def space_saving(k):
+    """Space-Saving with the k+1 counters it needs for Frequent's n/(k+1) guarantee."""
+    return SpaceSaving(k + 1)
+
+
+def zipf_stream(n, skew=1.2, universe=1 << 20, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.zipf(skew, size=n) % universe).astype(np.int64)
+
+
+def uniform_stream(n, universe=1 << 20, seed=0):
+    return np.random.default_rng(seed).integers(0, universe, size=n, dtype=np.int64)
+
+
+def adversarial_stream(n, k):
+    """k items n/(k+1) times each, item 0 half as often again, then never-seen items in a row.
+
+    Item 0 is the one true heavy hitter, so recall and precision mean
+    something on this stream too.
+    """
+    repeat = max(n // (k + 1), 1)
+    planted = np.zeros(max(repeat // 2, 1), dtype=np.int64)
+    heavy = np.concatenate([np.tile(np.arange(k, dtype=np.int64), repeat), planted])[:n]
+    return np.concatenate([heavy, np.arange(k, k + n - len(heavy), dtype=np.int64)])
+
+
+STREAMS = {
+    "zipf": lambda n, k, seed: zipf_stream(n, seed=seed),
+    "uniform": lambda n, k, seed: uniform_stream(n, seed=seed),
+    "adversarial": lambda n, k, seed: adversarial_stream(n, k),
+}
+
+# name -> (factory, whether the stream is fed with update_batch)
+BACKENDS = {
+    "naive": (NaiveFrequent, False),
+    "frequent": (Frequent, False),
+    "compact": (CompactFrequent, False),
+    "frequent-batch": (Frequent, True),
+    "lazy": (LazyFrequent, False),
+    "int": (IntFrequent, True),
+    "space-saving": (space_saving, False),
+    "lossy": (LossyCounting, False),
+}
+# The array-backed engine is slower than Frequent for a few percent less
+# memory per counter, so it only runs when asked for.
+DEFAULT_BACKENDS = sorted(set(BACKENDS) - {"compact"})
+
+
+def _feed(summary, stream, batched):
+    if batched:
+        for start in range(0, len(stream), BATCH_SIZE):
+            summary.update_batch(stream[start:start + BATCH_SIZE])
+    else:
+        summary.extend(stream)
+
+
+def _latencies(summary, stream, batched, samples):
+    """Per-update latencies in ns; for batched backends, per item of each batch.
+
+    Item-at-a-time backends see the whole stream but only every few updates
+    are timed, spread evenly so bursts at the end of the stream are sampled.
+    """
+    clock = time.perf_counter_ns
+    times = []
+    if batched:
+        for start in range(0, len(stream), BATCH_SIZE):
+            batch = stream[start:start + BATCH_SIZE]
+            begin = clock()
+            summary.update_batch(batch)
+            times.append((clock() - begin) / len(batch))
+    else:
+        update = summary.update
+        stride = max(len(stream) // samples, 1)
+        for start in range(0, len(stream), stride):
+            begin = clock()
+            update(stream[start])
+            times.append(clock() - begin)
+            for item in stream[start + 1:start + stride]:
+                update(item)
+    return np.asarray(times, dtype=np.float64)
+
+
+def _reported(summary, k):
+    """The monitored items whose upper bound exceeds n/(k+1), the same test for every backend."""
+    return [item for item in summary.counts() if summary.estimate(item)[1] * (k + 1) > summary.n]
+
+
+def _accuracy(reported, heavy):
+    found = len(set(reported) & heavy)
+    recall = found / len(heavy) if heavy else 1.0
+    precision = found / len(reported) if reported else 1.0
+    return recall, precision
+
+
+def heavy_hitters(stream, k):
+    """The items of ``stream`` occurring more than n/(k+1) times, counted exactly."""
+    keys, counts = np.unique(stream, return_counts=True)
+    return set(keys[counts * (k + 1) > len(stream)].tolist())
+
+
+def bench_one(backend, stream_name, stream, k, latency_samples=100000, memory_items=200000, heavy=None):
+    factory, batched = BACKENDS[backend]
+    items = stream if batched else stream.tolist()
+
+    summary = factory(k)
+    begin = time.perf_counter()
+    _feed(summary, items, batched)
+    elapsed = time.perf_counter() - begin
+    recall, precision = _accuracy(_reported(summary, k), heavy_hitters(stream, k) if heavy is None else heavy)
+
+    latencies = _latencies(factory(k), items, batched, latency_samples)
+    # The summary is built while tracing so its own allocation is counted.
+    prefix = items[:memory_items]
+    tracemalloc.start()
+    try:
+        _feed(factory(k), prefix, batched)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "backend": backend,
+        "stream": stream_name,
+        "k": k,
+        "n": len(stream),
+        "seconds": elapsed,
+        "items_per_sec": len(stream) / elapsed if elapsed else float("inf"),
+        "p50_ns": float(np.percentile(latencies, 50)),
+        "p99_ns": float(np.percentile(latencies, 99)),
+        "max_ns": float(latencies.max()),
+        "peak_bytes": peak,
+        "memory_items": min(memory_items, len(stream)),
+        "recall": recall,
+        "precision": precision,
+    }
+
+
+def run(backends, streams, ks, n, seed=0, **options):
+    results = []
+    # Per backend and k: it does not depend on the stream.
+    per_counter = {}
+    for stream_name in streams:
+        for k in ks:
+            stream = STREAMS[stream_name](n, k, seed)
+            heavy = heavy_hitters(stream, k)
+            for backend in backends:
+                row = bench_one(backend, stream_name, stream, k, heavy=heavy, **options)
+                if (backend, k) not in per_counter:
+                    per_counter[backend, k] = bytes_per_counter(BACKENDS[backend][0], k)
+                row["bytes_per_counter"] = per_counter[backend, k]
+                results.append(row)
+    return results
+
+
+def report(results, out):
+    out.write("%-16s %-12s %8s %10s %14s %10s %10s %10s %12s %10s %7s %9s\n"
+              % ("backend", "stream", "k", "n", "items/sec", "p50 ns", "p99 ns", "max ns", "peak KiB",
+                 "B/counter", "recall", "precision"))
+    for row in results:
+        out.write("%-16s %-12s %8d %10d %14.0f %10.0f %10.0f %10.0f %12.1f %10.1f %7.3f %9.3f\n"
+                  % (row["backend"], row["stream"], row["k"], row["n"], row["items_per_sec"],
+                     row["p50_ns"], row["p99_ns"], row["max_ns"], row["peak_bytes"] / 1024,
+                     row["bytes_per_counter"], row["recall"], row["precision"]))
+
+
+def dump(results, path):
+    meta = {"python": platform.python_version(), "machine": platform.machine(), "numpy": np.__version__}
+    with open(path, "w") as out:
+        json.dump({"meta": meta, "results": results}, out, indent=2)
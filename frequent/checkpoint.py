@@ -0,0 +1,141 @@
+"""Versioned little-endian binary snapshots of Frequent summaries.
+
+Layout, all integers little-endian::
+
+    header   magic "FREQ", u16 version, u8 item kind, u8 reserved,
+             u64 k, u64 n, u64 decrements, u64 groups, u64 counters
+    diffs    i64[groups]    value of each non-zero group minus the previous one
+    sizes    i64[groups]    counters in each group
+    items    int64 items: i64[counters]
+             bytes/str items: u64[counters + 1] offsets, then the data
+
+Groups are stored smallest value first, the first diff being the true
+value, exactly like the in-memory group list; counters are stored group by
+group, which encodes both their group pointers and their prev/next links.
+Empty counters are implied by k. Loading reads every column with
+``np.frombuffer`` straight from the buffer, without copying it.
+"""
+
+import os
+import struct
+import time
+
+import numpy as np
+
+MAGIC = b"FREQ"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBQQQQQ")
+ITEMS_INT, ITEMS_BYTES, ITEMS_STR = 0, 1, 2
+
+
+def _item_kind(items):
+    if all(type(item) is int for item in items):
+        return ITEMS_INT
+    if all(type(item) is bytes for item in items):
+        return ITEMS_BYTES
+    if all(type(item) is str for item in items):
+        return ITEMS_STR
+    raise TypeError("only summaries of int, bytes or str items can be checkpointed")
+
+
+def dumps(summary):
+    """Serialize ``summary`` to bytes."""
+    values, sizes, items = [], [], []
+    for value, group in summary.groups():
+        if value:
+            values.append(value)
+            sizes.append(len(group))
+            items.extend(group)
+    kind = _item_kind(items)
+    diffs = np.diff(np.asarray(values, dtype="<i8"), prepend=0)
+    parts = [
+        HEADER.pack(MAGIC, VERSION, kind, 0, summary.k, summary.n, summary.decrements, len(values), len(items)),
+        diffs.astype("<i8").tobytes(),
+        np.asarray(sizes, dtype="<i8").tobytes(),
+    ]
+    if kind == ITEMS_INT:
+        parts.append(np.asarray(items, dtype="<i8").tobytes())
+    else:
+        data = [item.encode() for item in items] if kind == ITEMS_STR else items
+        offsets = np.zeros(len(data) + 1, dtype="<u8")
+        np.cumsum([len(item) for item in data], out=offsets[1:])
+        parts.append(offsets.tobytes())
+        parts.extend(data)
+    return b"".join(parts)
+
+
+def loads(data, factory):
+    """Rebuild a summary of type ``factory`` from ``dumps`` output."""
+    view = memoryview(data)
+    magic, version, kind, _, k, n, decrements, groups, counters = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("not a Frequent checkpoint")
+    if version != VERSION:
+        raise ValueError("unsupported checkpoint version %d" % version)
+    offset = HEADER.size
+    diffs = np.frombuffer(view, dtype="<i8", count=groups, offset=offset)
+    offset += 8 * groups
+    sizes = np.frombuffer(view, dtype="<i8", count=groups, offset=offset)
+    offset += 8 * groups
+    if kind == ITEMS_INT:
+        items = np.frombuffer(view, dtype="<i8", count=counters, offset=offset).tolist()
+    else:
+        bounds = np.frombuffer(view, dtype="<u8", count=counters + 1, offset=offset)
+        offset += 8 * (counters + 1)
+        blob = view[offset:]
+        items = [bytes(blob[start:stop]) for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
+        if kind == ITEMS_STR:
+            items = [item.decode() for item in items]
+    summary = factory.__new__(factory)
+    summary.k = k
+    summary.n = n
+    summary.decrements = decrements
+    summary._snapshot = (None, ())
+    summary._restore(np.cumsum(diffs), sizes, items)
+    return summary
+
+
+def dump(summary, path):
+    """Write a checkpoint atomically: readers see the old file or the new one."""
+    temporary = "%s.tmp" % os.fspath(path)
+    with open(temporary, "wb") as out:
+        out.write(dumps(summary))
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(temporary, path)
+
+
+def load(path, factory):
+    with open(path, "rb") as source:
+        return loads(source.read(), factory)
+
+
+class Checkpointer:
+    """Saves a summary to ``path`` at most every ``interval`` seconds.
+
+    Call ``maybe_save`` from the ingestion loop; it is a cheap clock check
+    until the interval has passed, and nothing is written if the summary
+    has not changed since the last checkpoint.
+    """
+
+    def __init__(self, summary, path, interval=60.0, clock=time.monotonic):
+        self.summary = summary
+        self.path = path
+        self.interval = interval
+        self.clock = clock
+        self._saved = None
+        self._last = clock()
+
+    def maybe_save(self):
+        if self.clock() - self._last >= self.interval:
+            return self.save()
+        return False
+
+    def save(self):
+        self._last = self.clock()
+        version = (self.summary.n, self.summary.decrements)
+        if version == self._saved:
+            return False
+        dump(self.summary, self.path)
+        self._saved = version
+        return True
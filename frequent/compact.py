@@ -0,0 +1,291 @@
+"""An array-backed variant of the Frequent summary.
+
+Instead of one Python object per counter and per group, counters and groups
+are slots in preallocated ``array`` columns, linked by slot number. There
+are never more than k + 1 groups; group slots are recycled through a free
+list threaded through the ``next`` column, and the group columns only grow
+when that list runs dry.
+
+The link columns are small, but the items still need a Python list and a
+dictionary index, and those dominate: with many counters one takes only
+about 10% less memory than in ``Frequent`` (105 against 116 bytes at
+k=100000, the B/counter column of ``python -m frequent bench --backends
+frequent compact``), and every update is about twice as slow. For
+integer IDs, ``IntFrequent`` keeps the items in NumPy columns instead.
+"""
+
+import tracemalloc
+from array import array
+
+import numpy as np
+
+from .engine import _EMPTY, Frequent
+
+NIL = -1
+GROUP_CHUNK = 64
+
+
+class CompactFrequent(Frequent):
+    """Same behaviour as ``Frequent`` with the counters and groups in ``array`` columns."""
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.n = 0
+        self.decrements = 0
+        self._snapshot = (None, ())
+        self._reset()
+
+    def _reset(self):
+        k = self.k
+        self._items = [_EMPTY] * k
+        self._index = {}
+        # Counter columns: every counter starts in group 0, the zero group.
+        # Slot numbers fit in 32 bits; only the group deltas need 64.
+        self._group = array("i", bytes(4 * k))
+        self._prev = array("i", range(-1, k - 1))
+        self._next = array("i", range(1, k + 1))
+        self._next[k - 1] = NIL
+        # Group columns, grown on demand up to k + 1 slots.
+        self._diff = array("q", [0])
+        self._base = array("q", [self.decrements])
+        self._gprev = array("i", [NIL])
+        self._gnext = array("i", [NIL])
+        self._first = array("i", [0])
+        self._size = array("i", [k])
+        self._free = NIL
+        self._head = self._tail = 0
+
+    def _grow_groups(self):
+        start = len(self._diff)
+        extra = min(max(start, GROUP_CHUNK), self.k + 1 - start)
+        self._diff.extend(array("q", bytes(8 * extra)))
+        self._base.extend(array("q", bytes(8 * extra)))
+        self._gprev.extend(array("i", [NIL]) * extra)
+        self._gnext.extend(array("i", range(start + 1, start + extra + 1)))
+        self._gnext[-1] = NIL
+        self._first.extend(array("i", [NIL]) * extra)
+        self._size.extend(array("i", bytes(4 * extra)))
+        self._free = start
+
+    def update(self, item, weight=1):
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        self.n += weight
+        counter = self._index.get(item)
+        if counter is None:
+            head = self._head
+            diff = self._diff
+            if diff[head]:
+                if weight <= diff[head]:
+                    diff[head] -= weight
+                    self.decrements += weight
+                    return
+                weight -= diff[head]
+                self.decrements += diff[head]
+                diff[head] = 0
+            counter = self._first[head]
+            old = self._items[counter]
+            if old is not _EMPTY:
+                del self._index[old]
+            self._items[counter] = item
+            self._index[item] = counter
+        self._increment(counter, weight)
+
+    def _push(self, group, counter):
+        first = self._first[group]
+        self._group[counter] = group
+        self._prev[counter] = NIL
+        self._next[counter] = first
+        if first != NIL:
+            self._prev[first] = counter
+        self._first[group] = counter
+        self._size[group] += 1
+
+    def _remove(self, group, counter):
+        prev, nxt = self._prev[counter], self._next[counter]
+        if prev != NIL:
+            self._next[prev] = nxt
+        else:
+            self._first[group] = nxt
+        if nxt != NIL:
+            self._prev[nxt] = prev
+        self._size[group] -= 1
+
+    def _insert_group(self, diff, after):
+        if self._free == NIL:
+            self._grow_groups()
+        group = self._free
+        self._free = self._gnext[group]
+        nxt = self._gnext[after]
+        self._diff[group] = diff
+        self._base[group] = self._base[after] + diff
+        self._gprev[group] = after
+        self._gnext[group] = nxt
+        self._first[group] = NIL
+        self._size[group] = 0
+        self._gnext[after] = group
+        if nxt != NIL:
+            self._diff[nxt] -= diff
+            self._gprev[nxt] = group
+        else:
+            self._tail = group
+        return group
+
+    def _increment(self, counter, weight):
+        diff, gnext = self._diff, self._gnext
+        group = target = self._group[counter]
+        while gnext[target] != NIL and diff[gnext[target]] <= weight:
+            target = gnext[target]
+            weight -= diff[target]
+        if weight:
+            target = self._insert_group(weight, target)
+        self._remove(group, counter)
+        self._push(target, counter)
+        if not self._size[group]:
+            self._unlink(group)
+
+    def _unlink(self, group):
+        prev, nxt = self._gprev[group], self._gnext[group]
+        if nxt != NIL:
+            self._diff[nxt] += self._diff[group]
+            self._gprev[nxt] = prev
+        else:
+            self._tail = prev
+        if prev != NIL:
+            self._gnext[prev] = nxt
+        else:
+            self._head = nxt
+        self._gnext[group] = self._free
+        self._free = group
+
+    def _rebuild(self, pairs):
+        self._reset()
+        value = 0
+        tail = self._head
+        for item, count in sorted(pairs, key=lambda pair: pair[1]):
+            counter = self._first[self._head]
+            self._remove(self._head, counter)
+            if count != value:
+                tail = self._insert_group(count - value, tail)
+                value = count
+            self._items[counter] = item
+            self._index[item] = counter
+            self._push(tail, counter)
+        if not self._size[self._head]:
+            self._unlink(self._head)
+
+    def _restore(self, values, sizes, items):
+        # Lay the columns out directly: the counters in use first, group by
+        # group in value order, then the empty ones in a leading zero group.
+        k, used = self.k, len(items)
+        starts = np.cumsum(sizes, dtype=np.int64) - sizes
+        group = np.repeat(np.arange(len(values)), sizes)
+        if used < k:
+            values = np.concatenate([[0], values])
+            starts = np.concatenate([[used], starts])
+            sizes = np.concatenate([[k - used], sizes])
+            group = np.concatenate([group + 1, np.zeros(k - used, dtype=np.int64)])
+        count = len(values)
+        ends = starts + sizes - 1
+
+        def column(values, typecode="i"):
+            return array(typecode, np.asarray(values, dtype=typecode).tobytes())
+
+        prev = np.arange(-1, k - 1)
+        prev[starts] = NIL
+        nxt = np.arange(1, k + 1)
+        nxt[ends] = NIL
+        self._items = list(items) + [_EMPTY] * (k - used)
+        self._index = dict(zip(self._items[:used], range(used)))
+        self._group, self._prev, self._next = column(group), column(prev), column(nxt)
+        self._diff = column(np.diff(values, prepend=0), "q")
+        self._base = column(values + self.decrements, "q")
+        self._gprev = column(np.arange(-1, count - 1))
+        gnext = np.arange(1, count + 1)
+        gnext[-1] = NIL
+        self._gnext = column(gnext)
+        self._first = column(starts)
+        self._size = column(sizes)
+        self._free = NIL
+        self._head, self._tail = 0, count - 1
+
+    def groups(self):
+        value = 0
+        group = self._head
+        while group != NIL:
+            value += self._diff[group]
+            items = []
+            counter = self._first[group]
+            while counter != NIL:
+                if self._items[counter] is not _EMPTY:
+                    items.append(self._items[counter])
+                counter = self._next[counter]
+            yield value, items
+            group = self._gnext[group]
+
+    def count(self, item):
+        counter = self._index.get(item)
+        if counter is None:
+            return 0
+        return self._base[self._group[counter]] - self.decrements
+
+    def top(self, m):
+        result = []
+        decrements = self.decrements
+        group = self._tail
+        while group != NIL and len(result) < m:
+            value = self._base[group] - decrements
+            if not value:
+                break
+            counter = self._first[group]
+            while counter != NIL and len(result) < m:
+                result.append((self._items[counter], value))
+                counter = self._next[counter]
+            group = self._gprev[group]
+        return result
+
+    def above(self, threshold):
+        result = []
+        decrements = self.decrements
+        group = self._tail
+        while group != NIL:
+            value = self._base[group] - decrements
+            if value <= max(threshold, 0):
+                break
+            counter = self._first[group]
+            while counter != NIL:
+                result.append((self._items[counter], value))
+                counter = self._next[counter]
+            group = self._gprev[group]
+        return result
+
+    def __contains__(self, item):
+        counter = self._index.get(item)
+        return counter is not None and (self._group[counter] != self._head or self._diff[self._head] > 0)
+
+    def __len__(self):
+        head = self._head
+        return self.k - (0 if self._diff[head] else self._size[head])
+
+    def __repr__(self):
+        return "CompactFrequent(k=%d, n=%d, candidates=%d)" % (self.k, self.n, len(self))
+
+
+def bytes_per_counter(factory, k):
+    """Measure the heap bytes per counter of a summary with k distinct candidates.
+
+    The candidate items themselves are allocated before tracing starts, so
+    only the summary's own storage and its hash index are counted.
+    """
+    items = list(range(1 << 20, (1 << 20) + k))
+    tracemalloc.start()
+    try:
+        summary = factory(k)
+        for item in items:
+            summary.update(item)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size / k
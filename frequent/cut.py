@@ -0,0 +1,56 @@
+"""The batch rule every summary shares, and the one-at-a-time batch feed.
+
+Counts are added up first, then the (k+1)-th largest of them is subtracted
+from all and the ones that reach zero are dropped. Each unit subtracted
+cancels k+1 distinct occurrences, so the total subtracted stays within
+n/(k+1), as with one-at-a-time updates. Batch updates, merges and window
+reductions all apply it, to NumPy columns or to ``{item: count}`` dicts.
+"""
+
+import numpy as np
+
+
+def cut_arrays(keys, counts, k):
+    """Apply the rule to distinct ``keys`` and their ``counts``; returns the kept keys, their counts and the cut."""
+    if len(keys) <= k:
+        return keys, counts, 0
+    # np.partition puts the (k+1)-th largest value at index ``position``.
+    position = len(keys) - k - 1
+    cut = np.partition(counts, position)[position].item()
+    counts = counts - cut
+    keep = counts > 0
+    return keys[keep], counts[keep], cut
+
+
+def cut_counts(counts, k):
+    """Apply the rule to an ``{item: count}`` dict; returns the kept counts and the cut."""
+    if len(counts) <= k:
+        return counts, 0
+    cut = sorted(counts.values(), reverse=True)[k]
+    return {item: count - cut for item, count in counts.items() if count > cut}, cut
+
+
+def fold(summary, other):
+    """Fold the counts, n and decrements of ``other`` into ``summary`` and return the counts to keep.
+
+    The summary's own counters are left to the caller, which rebuilds them
+    from the returned dict in its own representation.
+    """
+    counts = summary.counts()
+    for item, count in other.items():
+        counts[item] = counts.get(item, 0) + count
+    counts, cut = cut_counts(counts, summary.k)
+    summary.decrements += other.decrements + cut
+    summary.n += other.n
+    return counts
+
+
+def feed(update, items, weights=None):
+    """``update_batch`` for summaries updated one item at a time: one weighted ``update`` per distinct item."""
+    if weights is None:
+        keys, weights = np.unique(np.asarray(items).ravel(), return_counts=True)
+    else:
+        keys = np.asarray(items).ravel()
+    for item, weight in zip(keys.tolist(), np.asarray(weights).tolist()):
+        if weight > 0:
+            update(item, weight)
@@ -0,0 +1,406 @@
+"""The Frequent (Misra-Gries) summary on Demaine et al.'s grouped counters.
+
+Counters with equal values share a group. Groups sit in a doubly linked
+list ordered by value, and each group stores only the difference between
+its value and the value of the previous group (the first group stores its
+true value). An increment moves one counter to the neighbouring group and
+"decrement every counter" is a single subtraction on the first group, so
+``update`` does O(1) work in the worst case for any k.
+
+Each group also remembers its value plus the decrements applied so far,
+which never changes once the group exists. Subtracting the running total of
+decrements gives any group's value in O(1), which lets reads start from the
+largest group instead of summing differences from the first one.
+"""
+
+import numpy as np
+
+from . import checkpoint
+from . import trace
+from .cut import cut_arrays, cut_counts, feed, fold
+from .metrics import SAMPLE_EVERY, Metrics, attach, detach
+
+_EMPTY = object()
+
+
+def _column(items):
+    """A 1-D array holding ``items``, as objects if NumPy would nest them."""
+    column = np.array(items)
+    if column.ndim != 1:
+        column = np.empty(len(items), dtype=object)
+        column[:] = items
+    return column
+
+
+def _same_kind(*columns):
+    """Whether NumPy can join the columns without converting any to another kind."""
+    kind = np.result_type(*columns).kind
+    return all(column.dtype.kind == kind for column in columns)
+
+
+class _Counter:
+    __slots__ = ("item", "group", "prev", "next")
+
+    def __init__(self):
+        self.item = _EMPTY
+        self.group = None
+        self.prev = None
+        self.next = None
+
+
+class _Group:
+    __slots__ = ("diff", "base", "prev", "next", "first", "size")
+
+    def __init__(self, diff, base=0):
+        self.diff = diff
+        self.base = base
+        self.prev = None
+        self.next = None
+        self.first = None
+        self.size = 0
+
+    def push(self, counter):
+        counter.group = self
+        counter.prev = None
+        counter.next = self.first
+        if self.first is not None:
+            self.first.prev = counter
+        self.first = counter
+        self.size += 1
+
+    def remove(self, counter):
+        if counter.prev is not None:
+            counter.prev.next = counter.next
+        else:
+            self.first = counter.next
+        if counter.next is not None:
+            counter.next.prev = counter.prev
+        counter.prev = counter.next = None
+        self.size -= 1
+
+
+class Frequent:
+    """Keeps at most k candidates for the items occurring more than n/(k+1) times."""
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.n = 0
+        # Total amount every counter has been decremented by.
+        self.decrements = 0
+        self._snapshot = (None, ())
+        self._index = {}
+        zero = _Group(0)
+        for _ in range(k):
+            zero.push(_Counter())
+        self._head = zero
+        self._tail = zero
+
+    def update(self, item, weight=1):
+        """Count ``weight`` occurrences of ``item``.
+
+        A weight above one is applied in one step: if every counter is in
+        use, all of them are first decremented together by the smaller of
+        the weight and the smallest counter. Unit weights take O(1) time; a
+        larger weight walks past the groups it jumps over.
+        """
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        self.n += weight
+        counter = self._index.get(item)
+        if counter is None:
+            head = self._head
+            if head.diff:
+                # All counters are full: decrement every one of them at once.
+                if weight <= head.diff:
+                    head.diff -= weight
+                    self.decrements += weight
+                    return
+                weight -= head.diff
+                self.decrements += head.diff
+                head.diff = 0
+            # Reuse a counter of the zero group. It may still be indexed
+            # under an item that was decremented away.
+            counter = head.first
+            if counter.item is not _EMPTY:
+                del self._index[counter.item]
+            counter.item = item
+            self._index[item] = counter
+        self._increment(counter, weight)
+
+    def extend(self, stream):
+        update = self.update
+        for item in stream:
+            update(item)
+
+    def update_batch(self, items, weights=None):
+        """Feed a whole array of items at once.
+
+        The batch is pre-aggregated with ``np.unique``. A batch of at most
+        2k distinct items goes through ``update`` once per distinct item:
+        hits are added to their counters in place, and a new item only
+        decrements when it finds every counter in use.
+
+        A larger batch is applied in bulk: its counts are added to the
+        current counters and every counter is then decremented once by the
+        (k+1)-th largest value, dropping those that reach zero. Each unit of
+        that bulk decrement cancels k+1 distinct occurrences, so the total
+        decrement is still at most n/(k+1) and every item occurring more
+        than n/(k+1) times remains a candidate. The groups are rebuilt from
+        scratch, which takes O(k) Python work per batch: batching pays off
+        when batches hold many more distinct items than k. For int64 IDs,
+        ``IntFrequent`` does all of it in NumPy.
+
+        With ``weights``, ``items[i]`` counts ``weights[i]`` times.
+        """
+        items = np.asarray(items).ravel()
+        if not items.size:
+            return
+        weighted = weights is not None
+        if weighted:
+            weights = np.asarray(weights, dtype=np.int64).ravel()
+            keys, weights = items[weights > 0], weights[weights > 0]
+        else:
+            keys, weights = np.unique(items, return_counts=True)
+        if len(keys) <= 2 * self.k:
+            feed(self.update, keys, weights)
+            return
+        total = int(weights.sum())
+        current = self.counts()
+        column = _column(list(current))
+        if current and not _same_kind(keys, column):
+            # NumPy would turn ints into floats or strings: sum them in a dict.
+            for key, weight in zip(keys.tolist(), weights.tolist()):
+                current[key] = current.get(key, 0) + weight
+            current, cut = cut_counts(current, self.k)
+            pairs = current.items()
+        else:
+            if current:
+                # Let NumPy widen both sides: the candidates may be longer
+                # strings or wider ints than anything in this batch.
+                keys = np.concatenate([keys, column])
+                weights = np.concatenate([weights, np.fromiter(current.values(), dtype=weights.dtype, count=len(current))])
+            if current or weighted:
+                keys, inverse = np.unique(keys, return_inverse=True)
+                summed = np.zeros(len(keys), dtype=np.int64)
+                np.add.at(summed, inverse, weights)
+                weights = summed
+            keys, weights, cut = cut_arrays(keys, weights, self.k)
+            pairs = zip(keys.tolist(), weights.tolist())
+        self.decrements += cut
+        self.n += total
+        self._rebuild(pairs)
+
+    def merge(self, other):
+        """Fold another summary into this one and return ``self``.
+
+        The counters are summed, then the (k+1)-th largest sum is subtracted
+        from all of them and the non-positive ones are dropped. The merged
+        summary keeps the guarantee for the combined stream of n = n1 + n2
+        items: every item occurring more than n/(k+1) times is a candidate.
+        """
+        self._rebuild(fold(self, other).items())
+        return self
+
+    def __getstate__(self):
+        return {"k": self.k, "n": self.n, "decrements": self.decrements, "counts": list(self.items())}
+
+    def __setstate__(self, state):
+        self.k = state["k"]
+        self.n = state["n"]
+        self.decrements = state["decrements"]
+        self._snapshot = (None, ())
+        self._rebuild(state["counts"])
+
+    def dump(self):
+        """The summary in the binary checkpoint format of ``frequent.checkpoint``."""
+        return checkpoint.dumps(self)
+
+    @classmethod
+    def load(cls, data):
+        """Rebuild a summary from ``dump`` output (any bytes-like object)."""
+        return checkpoint.loads(data, cls)
+
+    def _restore(self, values, sizes, items):
+        """Rebuild from per-group values and sizes (ascending) and the items group by group."""
+        self._rebuild(zip(items, np.repeat(values, sizes).tolist()))
+
+    def _rebuild(self, pairs):
+        """Replace the counters with ``(item, value)`` pairs, values positive."""
+        self._index = {}
+        head = self._head = self._tail = _Group(0, self.decrements)
+        for _ in range(self.k):
+            head.push(_Counter())
+        tail = head
+        value = 0
+        for item, count in sorted(pairs, key=lambda pair: pair[1]):
+            counter = head.first
+            head.remove(counter)
+            if count != value:
+                tail = self._insert_group(count - value, tail)
+                value = count
+            counter.item = item
+            self._index[item] = counter
+            tail.push(counter)
+        if not head.size:
+            # Every counter is in use, so there is no zero group.
+            self._unlink(head)
+
+    def _insert_group(self, diff, after):
+        nxt = after.next
+        group = _Group(diff, after.base + diff)
+        group.prev = after
+        group.next = nxt
+        after.next = group
+        if nxt is not None:
+            nxt.diff -= diff
+            nxt.prev = group
+        else:
+            self._tail = group
+        return group
+
+    def _increment(self, counter, weight):
+        group = target = counter.group
+        while target.next is not None and target.next.diff <= weight:
+            target = target.next
+            weight -= target.diff
+        if weight:
+            target = self._insert_group(weight, target)
+        group.remove(counter)
+        target.push(counter)
+        if not group.size:
+            self._unlink(group)
+
+    def _unlink(self, group):
+        prev, nxt = group.prev, group.next
+        if nxt is not None:
+            nxt.diff += group.diff
+            nxt.prev = prev
+        else:
+            self._tail = prev
+        if prev is not None:
+            prev.next = nxt
+        else:
+            self._head = nxt
+
+    def instrument(self, sample_every=SAMPLE_EVERY, callback=None):
+        """Start counting hot-path events on this summary and return the ``Metrics``."""
+        metrics = Metrics(sample_every, callback)
+        attach(self, metrics)
+        return metrics
+
+    def uninstrument(self):
+        detach(self)
+
+    def trace(self):
+        """Start recording what every update does to the groups and return the ``Trace``."""
+        events = trace.Trace()
+        trace.attach(self, events)
+        return events
+
+    def untrace(self):
+        trace.detach(self)
+
+    def groups(self):
+        """Yield ``(value, items)`` for each group, smallest value first."""
+        value = 0
+        group = self._head
+        while group is not None:
+            value += group.diff
+            items = []
+            counter = group.first
+            while counter is not None:
+                if counter.item is not _EMPTY:
+                    items.append(counter.item)
+                counter = counter.next
+            yield value, items
+            group = group.next
+
+    def items(self):
+        """Yield ``(item, count)`` for every candidate, smallest count first."""
+        for value, items in self.groups():
+            if value:
+                for item in items:
+                    yield item, value
+
+    def counts(self):
+        return dict(self.items())
+
+    def candidates(self):
+        return [item for item, _ in self.items()]
+
+    def count(self, item):
+        counter = self._index.get(item)
+        if counter is None:
+            return 0
+        return counter.group.base - self.decrements
+
+    def estimate(self, item):
+        """Bounds ``(lower, upper)`` on the true count of any ``item``, in O(1).
+
+        A counter misses at most one occurrence per unit of decrement, and
+        there are at most n/(k+1) of those.
+        """
+        lower = self.count(item)
+        return lower, lower + self.decrements
+
+    def top(self, m):
+        """The m candidates with the largest counts as ``(item, count)``, largest first.
+
+        Walks the groups backwards from the largest one, so it takes O(m)
+        time whatever k is.
+        """
+        result = []
+        decrements = self.decrements
+        group = self._tail
+        while group is not None and len(result) < m:
+            value = group.base - decrements
+            if not value:
+                break
+            counter = group.first
+            while counter is not None and len(result) < m:
+                result.append((counter.item, value))
+                counter = counter.next
+            group = group.prev
+        return result
+
+    def above(self, threshold):
+        """Every ``(item, count)`` with a count above ``threshold``, largest first."""
+        result = []
+        decrements = self.decrements
+        group = self._tail
+        while group is not None:
+            value = group.base - decrements
+            if value <= max(threshold, 0):
+                break
+            counter = group.first
+            while counter is not None:
+                result.append((counter.item, value))
+                counter = counter.next
+            group = group.prev
+        return result
+
+    def snapshot(self):
+        """All candidates as an immutable ``(item, count)`` tuple, largest first.
+
+        The tuple is built once per state of the summary and shared by every
+        reader until the next update. Readers in other threads must hold
+        whatever lock serializes the writers while calling this.
+        """
+        version, items = self._snapshot
+        if version != (self.n, self.decrements):
+            items = tuple(self.top(self.k))
+            self._snapshot = ((self.n, self.decrements), items)
+        return items
+
+    def __contains__(self, item):
+        counter = self._index.get(item)
+        return counter is not None and (counter.group is not self._head or self._head.diff > 0)
+
+    def __len__(self):
+        head = self._head
+        return self.k - (0 if head.diff else head.size)
+
+    def __repr__(self):
+        return "Frequent(k=%d, n=%d, candidates=%d)" % (self.k, self.n, len(self))
@@ -0,0 +1,152 @@
+"""Hierarchical heavy hitters over IP prefixes or URL paths.
+
+A ``HierarchicalFrequent`` keeps one summary per level of a hierarchy, most
+specific level first (a /32 address, then its /24, /16, ...), and feeds each
+batch to every level after generalizing it there, so a /24 can be a
+candidate even when none of its addresses is.
+
+``hhh(threshold)`` reports the hierarchical heavy hitters bottom-up with
+discounted counts: a prefix's count minus the counts of the heavy hitters
+already reported below it, so a /24 is only heavy for the traffic its heavy
+addresses do not explain.
+
+With ``sample=True`` each item goes to one level picked at random and the
+counts are scaled back up by the number of levels, as in randomized HHH
+(Ben Basat et al.): an update then costs the same however many levels
+there are, for estimates that are only probabilistically within bounds.
+"""
+
+import random
+
+import numpy as np
+
+from .engine import Frequent
+from .intid import IntFrequent
+
+
+class IPv4:
+    """IPv4 addresses as integers, generalized to the given prefix lengths."""
+
+    def __init__(self, lengths=(32, 24, 16, 8)):
+        self.lengths = sorted(lengths, reverse=True)
+        self.levels = len(self.lengths)
+
+    def summary(self, k):
+        return IntFrequent(k)
+
+    def generalize(self, items, level):
+        mask = ((1 << 32) - 1) ^ ((1 << (32 - self.lengths[level])) - 1)
+        return np.asarray(items, dtype=np.int64) & mask
+
+    def prefixes(self, items):
+        return [self.generalize(items, level) for level in range(self.levels)]
+
+    def label(self, prefix, level):
+        prefix = int(prefix)
+        return "%d.%d.%d.%d/%d" % (prefix >> 24, prefix >> 16 & 255, prefix >> 8 & 255, prefix & 255, self.lengths[level])
+
+
+class Paths:
+    """Slash-separated paths, generalized to their first ``depth``, ..., 1 segments."""
+
+    def __init__(self, depth=4):
+        self.levels = depth
+
+    def summary(self, k):
+        return Frequent(k)
+
+    def _prefixes(self, items, depth):
+        """Yield the first 1, 2, ..., ``depth`` segments of every path, one array each."""
+        rest = np.char.strip(np.asarray(items, dtype=str), "/")
+        prefix = np.zeros(len(rest), dtype=str)
+        for _ in range(depth):
+            head, _, rest = np.char.partition(rest, "/").T
+            prefix = np.where(head != "", np.char.add(np.char.add(prefix, "/"), head), prefix)
+            yield np.where(prefix != "", prefix, "/")
+
+    def generalize(self, items, level):
+        *_, prefix = self._prefixes(items, self.levels - level)
+        return prefix
+
+    def prefixes(self, items):
+        """Every level's prefixes of ``items``, most specific first, from one pass over the segments."""
+        return list(self._prefixes(items, self.levels))[::-1]
+
+    def label(self, prefix, level):
+        return prefix
+
+
+class HierarchicalFrequent:
+    """One Frequent summary of k counters per level of ``hierarchy``."""
+
+    def __init__(self, k, hierarchy, sample=False, seed=None):
+        self.k = k
+        self.n = 0
+        self.hierarchy = hierarchy
+        self.sample = sample
+        self.summaries = [hierarchy.summary(k) for _ in range(hierarchy.levels)]
+        self._random = random.Random(seed)
+        self._generator = np.random.default_rng(seed)
+
+    def update(self, item):
+        self.n += 1
+        levels = [self._random.randrange(len(self.summaries))] if self.sample else range(len(self.summaries))
+        for level in levels:
+            self.summaries[level].update(self.hierarchy.generalize([item], level)[0].item())
+
+    def extend(self, stream):
+        for item in stream:
+            self.update(item)
+
+    def update_batch(self, items):
+        """Feed a batch to every level, or each item to one random level with ``sample``."""
+        items = np.asarray(items)
+        self.n += len(items)
+        if not self.sample:
+            for summary, prefixes in zip(self.summaries, self.hierarchy.prefixes(items)):
+                summary.update_batch(prefixes)
+            return
+        picked = self._generator.integers(len(self.summaries), size=len(items))
+        for level, summary in enumerate(self.summaries):
+            batch = items[picked == level]
+            if len(batch):
+                summary.update_batch(self.hierarchy.generalize(batch, level))
+
+    def _scale(self):
+        return len(self.summaries) if self.sample else 1
+
+    def count(self, prefix, level):
+        return self.summaries[level].count(prefix) * self._scale()
+
+    def estimate(self, prefix, level):
+        """Bounds ``(lower, upper)`` on the count of ``prefix`` at ``level``; estimates with ``sample``."""
+        lower, upper = self.summaries[level].estimate(prefix)
+        return lower * self._scale(), upper * self._scale()
+
+    def hhh(self, threshold):
+        """Hierarchical heavy hitters as ``(label, level, count, discounted)``, most specific first.
+
+        A prefix is reported when its count minus the counts of the topmost
+        heavy hitters below it exceeds ``threshold``.
+        """
+        scale = self._scale()
+        heavy = []
+        below = {}
+        for level, summary in enumerate(self.summaries):
+            counts = summary.counts()
+            # Carry the counts explained at the level below up to this level's prefixes.
+            explained = {}
+            parents = self.hierarchy.generalize(list(below), level).tolist() if below else []
+            for parent, count in zip(parents, below.values()):
+                explained[parent] = explained.get(parent, 0) + count
+            below = explained
+            for prefix, count in counts.items():
+                count *= scale
+                discounted = count - below.get(prefix, 0)
+                if discounted > threshold:
+                    heavy.append((self.hierarchy.label(prefix, level), level, count, discounted))
+                    below[prefix] = count
+        return sorted(heavy, key=lambda hit: (hit[1], -hit[3]))
+
+    def __repr__(self):
+        return "HierarchicalFrequent(k=%d, levels=%d, n=%d)" % (self.k, len(self.summaries), self.n)
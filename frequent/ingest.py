@@ -0,0 +1,78 @@
+"""Chunked readers that turn files and pipes into NumPy batches of items."""
+
+import mmap
+import os
+import stat
+
+import numpy as np
+
+CHUNK_BYTES = 1 << 24
+
+
+def read_binary(source, dtype="<i8", chunk_bytes=CHUNK_BYTES):
+    """Yield arrays of fixed-width binary IDs.
+
+    Regular files are memory-mapped and every batch is a zero-copy view of
+    the mapping, so the input may be far larger than RAM. Pipes are read in
+    large chunks instead.
+    """
+    dtype = np.dtype(dtype)
+    chunk_bytes -= chunk_bytes % dtype.itemsize
+    if _is_regular_file(source):
+        count = os.fstat(source.fileno()).st_size // dtype.itemsize
+        if not count:
+            return
+        # The arrays keep the mapping alive; it is unmapped once they are gone.
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mapped, "madvise"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        ids = np.frombuffer(mapped, dtype=dtype, count=count)
+        step = chunk_bytes // dtype.itemsize
+        for offset in range(0, count, step):
+            yield ids[offset:offset + step]
+        return
+    tail = b""
+    while True:
+        chunk = source.read(chunk_bytes)
+        if not chunk:
+            break
+        chunk = tail + chunk
+        usable = len(chunk) - len(chunk) % dtype.itemsize
+        tail = chunk[usable:]
+        yield np.frombuffer(chunk, dtype=dtype, count=usable // dtype.itemsize)
+
+
+def read_lines(source, chunk_bytes=CHUNK_BYTES, dtype=None):
+    """Yield arrays of newline-delimited items, read in large chunks.
+
+    Items are kept as bytes; pass ``dtype`` (e.g. ``np.int64``) to parse
+    them as numbers instead. Blank lines are skipped.
+    """
+    tail = b""
+    while True:
+        chunk = source.read(chunk_bytes)
+        if not chunk:
+            break
+        cut = chunk.rfind(b"\n") + 1
+        if not cut:
+            tail += chunk
+            continue
+        lines = (tail + chunk[:cut]).splitlines()
+        tail = chunk[cut:]
+        if lines:
+            yield _to_array(lines, dtype)
+    lines = tail.splitlines()
+    if lines:
+        yield _to_array(lines, dtype)
+
+
+def _to_array(lines, dtype):
+    batch = np.array([line for line in lines if line])
+    return batch if dtype is None else batch.astype(dtype)
+
+
+def _is_regular_file(source):
+    try:
+        return stat.S_ISREG(os.fstat(source.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
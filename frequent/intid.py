@@ -0,0 +1,280 @@
+"""A Frequent summary specialized for 64-bit integer IDs.
+
+Candidates live in two preallocated NumPy columns, item and count, and are
+found through an open-addressing table of counter slots with linear
+probing, sized so k candidates fill at most half of it. Nothing is
+allocated per item: single updates are written into a preallocated buffer
+and applied as a batch. A batch is aggregated with ``np.unique`` and its
+distinct items are probed all at once; hits are added in place and only
+the misses change the candidate set.
+
+Batches follow ``Frequent.update_batch``: their counts are added to the
+counters, then the (k+1)-th largest count is subtracted from all of them,
+which keeps the n/(k+1) guarantee.
+"""
+
+from itertools import islice
+
+import numpy as np
+
+from . import checkpoint
+from .cut import cut_arrays
+
+BUFFER = 1 << 14
+EMPTY = -1
+# Fibonacci hashing: the top bits of the key times 2**64 / golden ratio.
+GOLDEN = 0x9E3779B97F4A7C15
+MASK64 = (1 << 64) - 1
+
+
+class IntFrequent:
+    """Keeps at most k candidates among int64 items occurring more than n/(k+1) times."""
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.n = 0
+        self.decrements = 0
+        self._snapshot = (None, ())
+        self._reset()
+
+    def _reset(self):
+        bits = max(3, (2 * self.k - 1).bit_length())
+        self._shift = 64 - bits
+        self._mask = (1 << bits) - 1
+        self._table = np.full(1 << bits, EMPTY, dtype=np.int32)
+        # The item of each occupied position, so probing reads one array.
+        self._keys = np.zeros(1 << bits, dtype=np.int64)
+        self._items = np.zeros(self.k, dtype=np.int64)
+        self._counts = np.zeros(self.k, dtype=np.int64)
+        self._used = 0
+        self._buffer = np.empty(BUFFER, dtype=np.int64)
+        self._pending = 0
+
+    def _hash(self, keys):
+        return ((keys.view(np.uint64) * np.uint64(GOLDEN)) >> np.uint64(self._shift)).view(np.int64)
+
+    def _lookup(self, keys):
+        """The counter slot of each key, or EMPTY, probing all keys together."""
+        if not self._used:
+            return np.full(len(keys), EMPTY, dtype=np.int64)
+        table, stored, mask = self._table, self._keys, self._mask
+        # The first probe covers the whole batch; only collisions go around again.
+        position = self._hash(keys)
+        slot = table[position]
+        occupied = slot >= 0
+        found = occupied & (stored[position] == keys)
+        slots = np.where(found, slot, EMPTY)
+        pending = np.flatnonzero(occupied & ~found)
+        position = position[pending]
+        while len(pending):
+            position = (position + 1) & mask
+            slot = table[position]
+            occupied = slot >= 0
+            found = occupied & (stored[position] == keys[pending])
+            slots[pending[found]] = slot[found]
+            more = occupied & ~found
+            pending, position = pending[more], position[more]
+        return slots
+
+    def _insert(self, slots):
+        """Add counter slots to the table; none of their items may be in it yet."""
+        table, mask = self._table, self._mask
+        position = self._hash(self._items[slots])
+        while len(slots):
+            free = np.flatnonzero(table[position] < 0)
+            # Keys probing the same free position in this round: the first wins.
+            taken, first = np.unique(position[free], return_index=True)
+            table[taken] = slots[free[first]]
+            self._keys[taken] = self._items[slots[free[first]]]
+            waiting = np.ones(len(slots), dtype=bool)
+            waiting[free[first]] = False
+            slots = slots[waiting]
+            position = (position[waiting] + 1) & mask
+
+    def _replace(self, keys, counts):
+        """Make ``keys`` (distinct) with ``counts`` the candidates, cutting down to k."""
+        keys, counts, cut = cut_arrays(keys, counts, self.k)
+        self.decrements += cut
+        used = self._used = len(keys)
+        self._items[:used] = keys
+        self._counts[:used] = counts
+        self._table.fill(EMPTY)
+        self._insert(np.arange(used))
+
+    def _apply(self, items, weights):
+        # Aggregate first, so each distinct item is probed once.
+        if weights is None:
+            keys, counts = np.unique(items, return_counts=True)
+        else:
+            keys, inverse = np.unique(items, return_inverse=True)
+            counts = np.zeros(len(keys), dtype=np.int64)
+            np.add.at(counts, inverse, weights)
+        slots = self._lookup(keys)
+        miss = slots < 0
+        hit = ~miss
+        self._counts[slots[hit]] += counts[hit]
+        keys, counts = keys[miss], counts[miss]
+        if not len(keys):
+            return
+        used = self._used
+        if used + len(keys) <= self.k:
+            self._used += len(keys)
+            self._items[used:self._used] = keys
+            self._counts[used:self._used] = counts
+            self._insert(np.arange(used, self._used))
+        else:
+            self._replace(np.concatenate([self._items[:used], keys]), np.concatenate([self._counts[:used], counts]))
+
+    def _flush(self):
+        if self._pending:
+            pending, self._pending = self._pending, 0
+            self._apply(self._buffer[:pending], None)
+
+    def update(self, item, weight=1):
+        """Count ``weight`` occurrences of ``item``; unit updates are buffered."""
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        if weight != 1:
+            self._flush()
+            self.n += weight
+            self._apply(np.array([item], dtype=np.int64), np.array([weight], dtype=np.int64))
+            return
+        self.n += 1
+        self._buffer[self._pending] = item
+        self._pending += 1
+        if self._pending == BUFFER:
+            self._flush()
+
+    def extend(self, stream):
+        if isinstance(stream, np.ndarray):
+            return self.update_batch(stream)
+        stream = iter(stream)
+        while True:
+            chunk = np.fromiter(islice(stream, BUFFER), dtype=np.int64)
+            if not chunk.size:
+                return
+            self.update_batch(chunk)
+
+    def update_batch(self, items, weights=None):
+        """Feed an array of IDs at once; with ``weights``, ``items[i]`` counts ``weights[i]`` times."""
+        self._flush()
+        items = np.ascontiguousarray(items, dtype=np.int64).ravel()
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.int64).ravel()
+            keep = weights > 0
+            items, weights = items[keep], weights[keep]
+            self.n += int(weights.sum())
+        else:
+            self.n += items.size
+        if items.size:
+            self._apply(items, weights)
+
+    def merge(self, other):
+        """Fold another summary into this one, like ``Frequent.merge``, and return ``self``."""
+        self._flush()
+        theirs = list(other.items())
+        keys = np.concatenate([self._items[:self._used], np.array([item for item, _ in theirs], dtype=np.int64)])
+        counts = np.concatenate([self._counts[:self._used], np.array([count for _, count in theirs], dtype=np.int64)])
+        keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(summed, inverse, counts)
+        self.decrements += other.decrements
+        self.n += other.n
+        self._replace(keys, summed)
+        return self
+
+    def __getstate__(self):
+        return {"k": self.k, "n": self.n, "decrements": self.decrements, "counts": list(self.items())}
+
+    def __setstate__(self, state):
+        self.k = state["k"]
+        self.n = state["n"]
+        self.decrements = state["decrements"]
+        self._snapshot = (None, ())
+        self._reset()
+        counts = state["counts"]
+        self._replace(np.array([item for item, _ in counts], dtype=np.int64), np.array([count for _, count in counts], dtype=np.int64))
+
+    def dump(self):
+        """The summary in the binary checkpoint format of ``frequent.checkpoint``."""
+        return checkpoint.dumps(self)
+
+    @classmethod
+    def load(cls, data):
+        return checkpoint.loads(data, cls)
+
+    def _restore(self, values, sizes, items):
+        self._reset()
+        self._replace(np.asarray(items, dtype=np.int64), np.repeat(values, sizes).astype(np.int64))
+
+    def _sorted(self):
+        self._flush()
+        counts = self._counts[:self._used]
+        order = np.argsort(counts, kind="stable")
+        return self._items[:self._used][order], counts[order]
+
+    def groups(self):
+        """Yield ``(value, items)`` for each distinct count, smallest first."""
+        items, counts = self._sorted()
+        bounds = np.flatnonzero(np.diff(counts)) + 1
+        for values, group in zip(np.split(counts, bounds), np.split(items, bounds)):
+            if len(values):
+                yield int(values[0]), group.tolist()
+
+    def items(self):
+        """Yield ``(item, count)`` for every candidate, smallest count first."""
+        items, counts = self._sorted()
+        return zip(items.tolist(), counts.tolist())
+
+    def counts(self):
+        return dict(self.items())
+
+    def candidates(self):
+        return [item for item, _ in self.items()]
+
+    def count(self, item):
+        self._flush()
+        table, items, mask = self._table, self._items, self._mask
+        position = ((int(item) * GOLDEN) & MASK64) >> self._shift
+        while True:
+            slot = table[position]
+            if slot < 0:
+                return 0
+            if items[slot] == item:
+                return int(self._counts[slot])
+            position = (position + 1) & mask
+
+    def estimate(self, item):
+        """Bounds ``(lower, upper)`` on the true count of any ``item``, like ``Frequent.estimate``."""
+        lower = self.count(item)
+        return lower, lower + self.decrements
+
+    def top(self, m):
+        """The m candidates with the largest counts as ``(item, count)``, largest first."""
+        items, counts = self._sorted()
+        return list(zip(items[::-1][:m].tolist(), counts[::-1][:m].tolist()))
+
+    def above(self, threshold):
+        items, counts = self._sorted()
+        keep = counts > max(threshold, 0)
+        return list(zip(items[keep][::-1].tolist(), counts[keep][::-1].tolist()))
+
+    def snapshot(self):
+        """All candidates as an immutable ``(item, count)`` tuple, largest first, cached per state."""
+        version, items = self._snapshot
+        if version != (self.n, self.decrements):
+            items = tuple(self.top(self.k))
+            self._snapshot = ((self.n, self.decrements), items)
+        return items
+
+    def __contains__(self, item):
+        return self.count(item) > 0
+
+    def __len__(self):
+        self._flush()
+        return self._used
+
+    def __repr__(self):
+        return "IntFrequent(k=%d, n=%d, candidates=%d)" % (self.k, self.n, len(self))
@@ -0,0 +1,111 @@
+"""The Frequent summary with lazy decrements, on a plain dictionary.
+
+Each counter stores its count plus the running total of decrements at the
+time, so "decrement every counter" only raises that total, as the first
+group's diff does in the grouped engine. Counters that reach zero stay in
+the dictionary until a new item needs a slot; then one sweep drops all of
+them and records the smallest remaining value, so the next misses know how
+far the total can rise before another counter hits zero.
+
+A sweep costs O(k), but it only runs after the total has risen since the
+last one, and it can rise by at most n/(k+1): updates take amortized O(1)
+time without touching any group list, at the price of an O(k) worst case
+instead of the grouped engine's O(1).
+"""
+
+from .cut import feed, fold
+
+
+class LazyFrequent:
+    """Keeps at most k candidates for the items occurring more than n/(k+1) times."""
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.n = 0
+        # Total amount every counter has been decremented by.
+        self.decrements = 0
+        # item -> count + decrements; a value equal to decrements is a zero counter.
+        self._counters = {}
+        # No counter holds less, so decrements can rise this far before a sweep.
+        self._floor = 0
+
+    def update(self, item, weight=1):
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        self.n += weight
+        counters = self._counters
+        if item in counters:
+            counters[item] += weight
+            return
+        while len(counters) == self.k:
+            room = self._floor - self.decrements
+            if room <= 0:
+                counters = self._sweep()
+                continue
+            # All counters are full and none is zero: decrement every one of them.
+            if weight <= room:
+                self.decrements += weight
+                return
+            self.decrements += room
+            weight -= room
+        value = counters[item] = self.decrements + weight
+        if value < self._floor:
+            self._floor = value
+
+    def _sweep(self):
+        """Drop the zero counters and find the smallest value left."""
+        decrements = self.decrements
+        counters = self._counters = {item: value for item, value in self._counters.items() if value > decrements}
+        self._floor = min(counters.values(), default=decrements)
+        return counters
+
+    def extend(self, stream):
+        update = self.update
+        for item in stream:
+            update(item)
+
+    def update_batch(self, items, weights=None):
+        feed(self.update, items, weights)
+
+    def merge(self, other):
+        """Fold another summary into this one like ``Frequent.merge`` and return ``self``."""
+        counts = fold(self, other)
+        self._counters = {item: count + self.decrements for item, count in counts.items()}
+        self._floor = min(self._counters.values(), default=self.decrements)
+        return self
+
+    def items(self):
+        decrements = self.decrements
+        return ((item, value - decrements) for item, value in self._counters.items() if value > decrements)
+
+    def counts(self):
+        return dict(self.items())
+
+    def candidates(self):
+        return [item for item, _ in self.items()]
+
+    def count(self, item):
+        return max(self._counters.get(item, 0) - self.decrements, 0)
+
+    def estimate(self, item):
+        """Bounds ``(lower, upper)`` on the true count of any ``item``, like ``Frequent.estimate``."""
+        lower = self.count(item)
+        return lower, lower + self.decrements
+
+    def top(self, m):
+        return sorted(self.items(), key=lambda pair: pair[1], reverse=True)[:m]
+
+    def above(self, threshold):
+        return sorted(((item, count) for item, count in self.items() if count > threshold),
+                      key=lambda pair: pair[1], reverse=True)
+
+    def __contains__(self, item):
+        return self.count(item) > 0
+
+    def __len__(self):
+        return sum(1 for _ in self.items())
+
+    def __repr__(self):
+        return "LazyFrequent(k=%d, n=%d, candidates=%d)" % (self.k, self.n, len(self))
@@ -0,0 +1,104 @@
+"""Lossy Counting (Manku and Motwani) with the Frequent summary's interface.
+
+The stream is cut into buckets of k+1 items. Each entry keeps a count f of
+the occurrences seen since it was created and the bound d on how many it
+may have missed before that; at the end of every bucket, entries with
+f + d no larger than the bucket number are dropped. With k it guarantees
+the same n/(k+1) error as Frequent, ``f <= true count <= f + d``, but the
+number of entries is not fixed: it can grow to O(k log(n/k)).
+"""
+
+from .cut import feed
+
+
+class LossyCounting:
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.n = 0
+        # The most any item may have been undercounted by.
+        self.decrements = 0
+        # item -> [f, d]
+        self._entries = {}
+
+    def _buckets(self):
+        """Number of completed buckets."""
+        return self.n // (self.k + 1)
+
+    def update(self, item, weight=1):
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        buckets = self._buckets()
+        self.n += weight
+        entry = self._entries.get(item)
+        if entry is None:
+            self._entries[item] = [weight, buckets]
+        else:
+            entry[0] += weight
+        if self._buckets() != buckets:
+            self._prune()
+
+    def extend(self, stream):
+        update = self.update
+        for item in stream:
+            update(item)
+
+    def update_batch(self, items, weights=None):
+        feed(self.update, items, weights)
+
+    def _prune(self):
+        buckets = self._buckets()
+        self._entries = {item: entry for item, entry in self._entries.items() if entry[0] + entry[1] > buckets}
+        self.decrements = buckets
+
+    def merge(self, other):
+        """Add up both summaries; an item missing from one may have been missed up to its bucket number."""
+        mine, theirs = self._entries, other._entries
+        missed_mine, missed_theirs = self._buckets(), other._buckets()
+        merged = {}
+        for item in mine.keys() | theirs.keys():
+            f1, d1 = mine.get(item, (0, missed_mine))
+            f2, d2 = theirs.get(item, (0, missed_theirs))
+            merged[item] = [f1 + f2, d1 + d2]
+        self._entries = merged
+        self.n += other.n
+        self._prune()
+        return self
+
+    def items(self):
+        return ((item, entry[0]) for item, entry in self._entries.items())
+
+    def counts(self):
+        return dict(self.items())
+
+    def error(self, item):
+        entry = self._entries.get(item)
+        return entry[1] if entry is not None else self._buckets()
+
+    def count(self, item):
+        entry = self._entries.get(item)
+        return entry[0] if entry is not None else 0
+
+    def estimate(self, item):
+        """Bounds ``(f, f + d)`` on the true count of any ``item``, in O(1)."""
+        entry = self._entries.get(item)
+        if entry is None:
+            return 0, self._buckets()
+        return entry[0], entry[0] + entry[1]
+
+    def top(self, m):
+        return sorted(self.items(), key=lambda pair: pair[1], reverse=True)[:m]
+
+    def candidates(self):
+        """The entries that may occur more than n/(k+1) times."""
+        return [item for item, (f, d) in self._entries.items() if (f + d) * (self.k + 1) > self.n]
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return "LossyCounting(k=%d, n=%d, entries=%d)" % (self.k, self.n, len(self))
@@ -0,0 +1,97 @@
+"""Opt-in hot-path counters for Frequent summaries.
+
+Instrumenting a summary shadows its ``update``, ``_rebuild``,
+``_insert_group`` and ``_unlink`` methods with counting wrappers on that one
+instance. Uninstrumented summaries run the plain class methods, so turning
+instrumentation off leaves no overhead at all. Tracing shadows most of the
+same methods, so a summary can be instrumented or traced, not both at once.
+"""
+
+import time
+from collections import deque
+
+SAMPLE_EVERY = 1024
+
+
+class Metrics:
+    """Counts which branch of the algorithm each update took.
+
+    ``hits`` incremented an existing counter, ``inserts`` took an empty
+    counter, ``decrements`` found every counter in use and decremented them
+    all. ``splits`` and ``merges`` count groups created and removed, and
+    ``rebuilds`` counts the times the groups were rebuilt from scratch, by
+    merges and by large batch updates (the groups they build are included
+    in ``splits``). Small batch updates count as one update per distinct item. Every
+    ``sample_every``-th update is timed; the timing in nanoseconds goes to
+    ``callback`` if given and to the ``timings`` ring buffer.
+    """
+
+    FIELDS = ("updates", "hits", "inserts", "decrements", "splits", "merges", "rebuilds")
+
+    def __init__(self, sample_every=SAMPLE_EVERY, callback=None, keep=1024):
+        self.sample_every = sample_every
+        self.callback = callback
+        self.timings = deque(maxlen=keep)
+        self.reset()
+
+    def reset(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+        self.timings.clear()
+
+    def as_dict(self, summary):
+        """The counters plus the current shape of the group list."""
+        metrics = {field: getattr(self, field) for field in self.FIELDS}
+        metrics["groups"] = sum(1 for _ in summary.groups())
+        metrics["zero_group"] = summary.k - len(summary)
+        metrics["timings_ns"] = list(self.timings)
+        return metrics
+
+
+def attach(summary, metrics):
+    if "tracing" in summary.__dict__:
+        raise RuntimeError("the summary is being traced; call untrace() before instrumenting it")
+    cls = type(summary)
+    clock = time.perf_counter_ns
+
+    def update(item, weight=1):
+        metrics.updates += 1
+        if item in summary:
+            metrics.hits += 1
+        elif len(summary) < summary.k:
+            metrics.inserts += 1
+        else:
+            metrics.decrements += 1
+        if metrics.updates % metrics.sample_every:
+            return cls.update(summary, item, weight)
+        begin = clock()
+        cls.update(summary, item, weight)
+        elapsed = clock() - begin
+        metrics.timings.append(elapsed)
+        if metrics.callback is not None:
+            metrics.callback(elapsed)
+
+    def rebuild(pairs):
+        metrics.rebuilds += 1
+        return cls._rebuild(summary, pairs)
+
+    def insert_group(diff, after):
+        metrics.splits += 1
+        return cls._insert_group(summary, diff, after)
+
+    def unlink(group):
+        metrics.merges += 1
+        return cls._unlink(summary, group)
+
+    summary.update = update
+    summary._rebuild = rebuild
+    summary._insert_group = insert_group
+    summary._unlink = unlink
+    summary.metrics = metrics
+
+
+def detach(summary):
+    if "metrics" not in summary.__dict__:
+        return
+    for name in ("update", "_rebuild", "_insert_group", "_unlink", "metrics"):
+        summary.__dict__.pop(name, None)
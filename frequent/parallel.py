@@ -0,0 +1,54 @@
+"""Build Frequent summaries on several cores and merge them."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import Frequent
+
+CHUNK_SIZE = 1 << 22
+
+
+def _summarize(k, source, start, stop, dtype, chunk_size):
+    if isinstance(source, str):
+        source = np.memmap(source, dtype=dtype, mode="r")
+    summary = Frequent(k)
+    for offset in range(start, stop, chunk_size):
+        summary.update_batch(source[offset:min(offset + chunk_size, stop)])
+    return summary
+
+
+def tree_merge(summaries):
+    """Merge summaries pairwise, level by level, into a single one."""
+    summaries = list(summaries)
+    if not summaries:
+        raise ValueError("nothing to merge")
+    while len(summaries) > 1:
+        merged = [a.merge(b) for a, b in zip(summaries[::2], summaries[1::2])]
+        if len(summaries) % 2:
+            merged.append(summaries[-1])
+        summaries = merged
+    return summaries[0]
+
+
+def process_pool(source, k, workers=None, dtype=np.int64, chunk_size=CHUNK_SIZE):
+    """Summarize ``source`` with one partial Frequent summary per worker process.
+
+    ``source`` is either an integer array or the path of a raw binary file of
+    ``dtype`` IDs, which each worker maps with ``np.memmap`` so only offsets
+    cross the process boundary. The partial summaries are tree-merged.
+    """
+    workers = workers or os.cpu_count() or 1
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        length = os.path.getsize(source) // np.dtype(dtype).itemsize
+        bounds = np.linspace(0, length, workers + 1).astype(np.int64).tolist()
+        jobs = [(source, start, stop) for start, stop in zip(bounds, bounds[1:])]
+    else:
+        source = np.asarray(source).ravel()
+        bounds = np.linspace(0, len(source), workers + 1).astype(np.int64).tolist()
+        jobs = [(source[start:stop], 0, stop - start) for start, stop in zip(bounds, bounds[1:])]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_summarize, k, part, start, stop, dtype, chunk_size) for part, start, stop in jobs]
+        return tree_merge(future.result() for future in futures)
@@ -0,0 +1,113 @@
+"""A Frequent summary that several threads can feed at once.
+
+Items are hash-partitioned across independent shards, each with its own
+lock, so writers only contend when they hit the same shard. Every item lives
+in exactly one shard, and an item occurring more than n/(k+1) times overall
+occurs more than n_s/(k+1) times in its shard of n_s items, so it is a
+candidate there. Queries merge the shards with the usual merge rule, which
+keeps the n/(k+1) guarantee for the whole stream.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from .engine import Frequent
+
+
+class ShardedFrequent:
+    """Hash-partitions updates across ``shards`` Frequent summaries of k counters each."""
+
+    def __init__(self, k, shards=None, factory=Frequent):
+        shards = shards or os.cpu_count() or 1
+        self.k = k
+        self.factory = factory
+        self._shards = [factory(k) for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._merged = (None, None)
+
+    @property
+    def n(self):
+        return sum(shard.n for shard in self._shards)
+
+    def update(self, item, weight=1):
+        slot = hash(item) % len(self._shards)
+        with self._locks[slot]:
+            self._shards[slot].update(item, weight)
+
+    def extend(self, stream):
+        """Partition the items first so each shard's lock is taken once."""
+        parts = [[] for _ in self._shards]
+        count = len(parts)
+        for item in stream:
+            parts[hash(item) % count].append(item)
+        for shard, lock, part in zip(self._shards, self._locks, parts):
+            if part:
+                with lock:
+                    shard.extend(part)
+
+    def update_batch(self, items, weights=None):
+        """Aggregate an array once, then hand each shard its keys and counts.
+
+        With ``weights``, ``items[i]`` counts ``weights[i]`` times.
+        """
+        items = np.asarray(items).ravel()
+        if weights is None:
+            keys, counts = np.unique(items, return_counts=True)
+        else:
+            weights = np.asarray(weights, dtype=np.int64).ravel()
+            keep = weights > 0
+            keys, inverse = np.unique(items[keep], return_inverse=True)
+            counts = np.zeros(len(keys), dtype=np.int64)
+            np.add.at(counts, inverse, weights[keep])
+        if not len(keys):
+            return
+        slots = np.fromiter((hash(key) % len(self._shards) for key in keys.tolist()), dtype=np.int64, count=len(keys))
+        for slot, (shard, lock) in enumerate(zip(self._shards, self._locks)):
+            mask = slots == slot
+            if mask.any():
+                with lock:
+                    shard.update_batch(keys[mask], counts[mask])
+
+    def _versions(self):
+        versions = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                versions.append((shard.n, shard.decrements))
+        return versions
+
+    def summary(self):
+        """A Frequent summary of the whole stream, merged from the shards.
+
+        Each shard is read under its own lock, so writers to other shards
+        keep going. The merge is only redone when a shard has changed since
+        the last query; the returned summary is shared and must not be
+        updated by the caller.
+        """
+        versions, merged = self._merged
+        if merged is not None and versions == self._versions():
+            return merged
+        merged = self.factory(self.k)
+        versions = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                versions.append((shard.n, shard.decrements))
+                merged.merge(shard)
+        self._merged = (versions, merged)
+        return merged
+
+    def estimate(self, item):
+        """Bounds on the count of ``item`` from its own shard, which saw all of its occurrences."""
+        slot = hash(item) % len(self._shards)
+        with self._locks[slot]:
+            return self._shards[slot].estimate(item)
+
+    def counts(self):
+        return self.summary().counts()
+
+    def top(self, m):
+        return self.summary().top(m)
+
+    def snapshot(self):
+        return self.summary().snapshot()
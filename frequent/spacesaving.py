@@ -0,0 +1,99 @@
+"""Space-Saving on the same grouped counters as the Frequent engine.
+
+Where Frequent decrements every counter when an unmonitored item arrives
+and all counters are in use, Space-Saving hands that item the counter with
+the smallest value and increments it, remembering the old value as the
+item's possible overcount. The smallest counter is always the first one of
+the first group, so this is the stream-summary structure of Metwally et al.
+and every update is O(1) as well.
+
+Counts never underestimate: ``count - error <= true count <= count``. The
+smallest of k counters is at most n/k, so every item occurring more than
+n/k times is monitored; Space-Saving with k+1 counters gives the n/(k+1)
+guarantee of Frequent with k.
+"""
+
+from .cut import feed
+from .engine import _EMPTY, Frequent
+
+
+class SpaceSaving(Frequent):
+    def __init__(self, k):
+        super().__init__(k)
+        self._errors = {}
+
+    def update(self, item, weight=1):
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        self.n += weight
+        counter = self._index.get(item)
+        if counter is None:
+            # Take over the smallest counter, which is empty while k items
+            # have not been seen yet.
+            counter = self._head.first
+            if counter.item is not _EMPTY:
+                del self._index[counter.item]
+                del self._errors[counter.item]
+            counter.item = item
+            self._index[item] = counter
+            self._errors[item] = self._head.base - self.decrements
+        self._increment(counter, weight)
+
+    def update_batch(self, items, weights=None):
+        feed(self.update, items, weights)
+
+    def error(self, item):
+        """How much the count of a monitored ``item`` may exceed its true count."""
+        return self._errors.get(item, 0)
+
+    def estimate(self, item):
+        """Bounds ``(lower, upper)`` on the true count of any ``item``, in O(1)."""
+        counter = self._index.get(item)
+        if counter is None:
+            return 0, self._minimum()
+        count = counter.group.base - self.decrements
+        return count - self._errors[item], count
+
+    def _minimum(self):
+        return self._head.base - self.decrements if len(self) == self.k else 0
+
+    def merge(self, other):
+        """Sum both summaries and keep the k largest counts.
+
+        An item missing from a full summary may have occurred up to that
+        summary's smallest count, so that is what it contributes, both to
+        its count and to its error.
+        """
+        mine, theirs = self.counts(), other.counts()
+        low_mine, low_theirs = self._minimum(), other._minimum()
+        merged = {}
+        for item in mine.keys() | theirs.keys():
+            count = mine.get(item, low_mine) + theirs.get(item, low_theirs)
+            error = (self.error(item) if item in mine else low_mine) + (other.error(item) if item in theirs else low_theirs)
+            merged[item] = (count, error)
+        kept = sorted(merged.items(), key=lambda pair: pair[1][0], reverse=True)[:self.k]
+        self.n += other.n
+        self._rebuild((item, count) for item, (count, _) in kept)
+        self._errors = {item: error for item, (_, error) in kept}
+        return self
+
+    def candidates(self):
+        """The monitored items that may occur more than n/(k+1) times."""
+        return [item for item, count in self.items() if count * (self.k + 1) > self.n]
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["errors"] = self._errors
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._errors = state["errors"]
+
+    def _restore(self, values, sizes, items):
+        # Checkpoints do not carry the errors, so assume the worst for each.
+        super()._restore(values, sizes, items)
+        self._errors = dict(self.items())
+
+    def __repr__(self):
+        return "SpaceSaving(k=%d, n=%d, monitored=%d)" % (self.k, self.n, len(self))
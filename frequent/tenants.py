@@ -0,0 +1,316 @@
+"""Frequent summaries for many tenants in one shared, size-capped arena.
+
+Instead of one summary object per tenant, every counter of every tenant is
+a row of two preallocated NumPy columns, item and count, and each tenant
+owns a block of k rows in them, kept sorted by item. Tenants are
+non-negative integers, each given the next free slot when it first shows
+up; their k, n, decrement totals and blocks are per-slot columns too, so
+sparse ids cost no more than dense ones. A batch
+of ``(tenant, item)`` pairs is sorted on its own and merged into the blocks
+of the tenants it touches, which are then cut back to their k with the usual
+rule, subtracting the (k+1)-th largest count, so a batch costs time in
+proportion to itself and those blocks, never to the whole arena.
+
+The arena holds ``max_bytes // COUNTER_BYTES`` counters. Each tenant with
+traffic gets ``min_k`` of them plus a share of the rest proportional to its
+part of the stream. Shares are recomputed, and the blocks repacked, only
+when the stream has grown by an eighth since the last time or when a new
+tenant's block does not fit, so that work is amortized over the items in
+between: k grows for busy tenants and shrinks (by the same cut) for quiet
+ones. A tenant whose k changed over time still undercounts any item by at
+most its decrement total, which ``estimate`` reports.
+"""
+
+import numpy as np
+
+COUNTER_BYTES = 8 + 8
+BUFFER = 1 << 14
+# Counters left unshared when the arena is repacked, for new tenants to take.
+RESERVE = 16
+# Blocks longer than this are cut on their own with np.partition.
+LARGE = 1 << 12
+
+
+class MultiFrequent:
+    """Per-tenant Frequent summaries of int64 items sharing ``max_bytes`` of counters."""
+
+    def __init__(self, max_bytes, min_k=1):
+        if min_k < 1:
+            raise ValueError("min_k must be at least 1")
+        self.capacity = max_bytes // COUNTER_BYTES
+        if self.capacity < min_k:
+            raise ValueError("max_bytes does not fit a single tenant")
+        self.min_k = min_k
+        self._items = np.zeros(self.capacity, dtype=np.int64)
+        self._counts = np.zeros(self.capacity, dtype=np.int64)
+        # End of the last block; the rows after it are free.
+        self._top = 0
+        # Per-tenant columns, indexed by slot and grown as tenants appear.
+        self._k = np.zeros(0, dtype=np.int64)
+        self._n = np.zeros(0, dtype=np.int64)
+        self._decrements = np.zeros(0, dtype=np.int64)
+        self._start = np.zeros(0, dtype=np.int64)
+        self._size = np.zeros(0, dtype=np.int64)
+        # tenant id -> slot in the per-tenant columns
+        self._slots = {}
+        self._total = 0
+        self._shared_at = 0
+        self._pending_tenants = np.empty(BUFFER, dtype=np.int64)
+        self._pending_items = np.empty(BUFFER, dtype=np.int64)
+        self._pending = 0
+        # New tenant ids among the buffered updates, already counted against the budget.
+        self._arriving = set()
+
+    def _grow(self, slots):
+        if slots > len(self._n):
+            extra = max(slots, 2 * len(self._n)) - len(self._n)
+            zeros = np.zeros(extra, dtype=np.int64)
+            self._k, self._n, self._decrements, self._start, self._size = (
+                np.concatenate([column, zeros]) for column in (self._k, self._n, self._decrements, self._start, self._size))
+
+    def _share(self):
+        """k for every tenant: min_k each, most of the rest in proportion to each tenant's n."""
+        active = self._n > 0
+        spare = self.capacity - self.min_k * len(self._slots)
+        spare -= spare // RESERVE
+        share = np.floor(spare * (self._n / self._total)).astype(np.int64)
+        k = np.where(active, self.min_k + share, 0)
+        # Rounding may hand out a few counters too many; take them from the largest.
+        excess = int(k.sum()) - self.capacity
+        if excess > 0:
+            k[np.argsort(k)[len(k) - excess:]] -= 1
+        return k
+
+    def update(self, tenant, item, weight=1):
+        """Count ``weight`` occurrences of ``item`` for ``tenant``; unit updates are buffered.
+
+        The tenant id and the budget are checked right away, so an update
+        that is accepted into the buffer is never rejected when it is applied.
+        """
+        if weight < 1:
+            raise ValueError("weight must be at least 1")
+        if weight != 1:
+            return self.update_batch([tenant], [item], [weight])
+        new = tenant not in self._slots and tenant not in self._arriving
+        if new:
+            if tenant < 0:
+                raise ValueError("tenant ids must be non-negative")
+            tenants = len(self._slots) + len(self._arriving) + 1
+            if self.min_k * tenants > self.capacity:
+                raise MemoryError("%d tenants need more than the %d counters available" % (tenants, self.capacity))
+        self._pending_tenants[self._pending] = tenant
+        self._pending_items[self._pending] = item
+        if new:
+            self._arriving.add(tenant)
+        self._pending += 1
+        if self._pending == BUFFER:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._apply(self._pending_tenants[:self._pending], self._pending_items[:self._pending], None)
+            # Only now: if applying failed, the buffer is still there.
+            self._pending = 0
+            self._arriving.clear()
+
+    def update_batch(self, tenants, items, weights=None):
+        """Feed interleaved ``(tenants[i], items[i])`` pairs; with ``weights``, each counts ``weights[i]`` times."""
+        self._flush()
+        tenants = np.asarray(tenants, dtype=np.int64).ravel()
+        items = np.asarray(items, dtype=np.int64).ravel()
+        if len(tenants) != len(items):
+            raise ValueError("tenants and items must have the same length")
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.int64).ravel()
+            keep = weights > 0
+            tenants, items, weights = tenants[keep], items[keep], weights[keep]
+        if len(tenants):
+            self._apply(tenants, items, weights)
+
+    def _apply(self, tenants, items, weights):
+        if tenants.min() < 0:
+            raise ValueError("tenant ids must be non-negative")
+        tenants, items, weights = _aggregate(tenants, items, np.ones(len(tenants), dtype=np.int64) if weights is None else weights)
+        first = np.flatnonzero(np.concatenate([[True], tenants[1:] != tenants[:-1]]))
+        ids = tenants[first].tolist()
+        slots = self._slots
+        arriving = [tenant for tenant in ids if tenant not in slots]
+
+        # Check the budget before changing anything.
+        if self.min_k * (len(slots) + len(arriving)) > self.capacity:
+            raise MemoryError("%d tenants need more than the %d counters available" % (len(slots) + len(arriving), self.capacity))
+        new = np.arange(len(slots), len(slots) + len(arriving))
+        self._grow(len(slots) + len(arriving))
+        slots.update(zip(arriving, new.tolist()))
+        # From here on, tenants are known by their slots.
+        touched = np.array([slots[tenant] for tenant in ids], dtype=np.int64)
+        tenants = np.repeat(touched, np.diff(np.append(first, len(tenants))))
+        self._n[touched] += np.add.reduceat(weights, first)
+        self._total += int(weights.sum())
+
+        if self._total > self._shared_at + self._shared_at // 8 or self._top + self.min_k * len(new) > self.capacity:
+            self._repack()
+        else:
+            self._k[new] = self.min_k
+            self._start[new] = self._top + self.min_k * np.arange(len(new))
+            self._top += self.min_k * len(new)
+
+        # Hits are added in place; only the blocks of tenants with misses change.
+        start, size = self._start[tenants], self._size[tenants]
+        position = _search(self._items, start, start + size, items)
+        hit = position < start + size
+        hit[hit] = self._items[position[hit]] == items[hit]
+        self._counts[position[hit]] += weights[hit]
+        miss = ~hit
+        if not miss.any():
+            return
+        tenants, items, weights, position = tenants[miss], items[miss], weights[miss], position[miss]
+        first = np.flatnonzero(np.concatenate([[True], tenants[1:] != tenants[:-1]]))
+        owners = tenants[first]
+        rows, lengths = self._rows(owners)
+        # Where each miss goes among the gathered rows, keeping every block sorted by item.
+        begin = np.cumsum(lengths) - lengths
+        at = position - self._start[tenants] + np.repeat(begin, np.diff(np.append(first, len(tenants))))
+        self._store(owners, lengths + np.diff(np.append(first, len(tenants))),
+                    np.insert(self._items[rows], at, items), np.insert(self._counts[rows], at, weights))
+
+    def _rows(self, owners):
+        """Arena rows of the blocks of ``owners``, block after block, and their lengths."""
+        lengths = self._size[owners]
+        rows = np.repeat(self._start[owners] - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        return rows, lengths
+
+    def _repack(self):
+        """Share the arena out again and move every block to its new place."""
+        self._shared_at = self._total
+        owners = np.flatnonzero(self._size)
+        rows, lengths = self._rows(owners)
+        items, counts = self._items[rows], self._counts[rows]
+        self._k = self._share()
+        self._start = np.cumsum(self._k) - self._k
+        self._top = int(self._k.sum())
+        self._store(owners, lengths, items, counts)
+
+    def _store(self, owners, lengths, items, counts):
+        """Cut every owner with more than k counters by its (k+1)-th largest count and write the blocks back."""
+        cut = _cuts(counts, lengths, self._k[owners])
+        if cut.any():
+            self._decrements[owners] += cut
+            counts = counts - np.repeat(cut, lengths)
+            keep = counts > 0
+            items, counts = items[keep], counts[keep]
+            kept = np.concatenate([[0], np.cumsum(keep)])
+            ends = np.cumsum(lengths)
+            lengths = kept[ends] - kept[ends - lengths]
+        self._size[owners] = lengths
+        rows, _ = self._rows(owners)
+        self._items[rows] = items
+        self._counts[rows] = counts
+
+    def _slot(self, tenant):
+        self._flush()
+        return self._slots.get(tenant)
+
+    def _run(self, tenant):
+        slot = self._slot(tenant)
+        if slot is None:
+            return slice(0, 0)
+        return slice(self._start[slot], self._start[slot] + self._size[slot])
+
+    def counts(self, tenant):
+        run = self._run(tenant)
+        return dict(zip(self._items[run].tolist(), self._counts[run].tolist()))
+
+    def top(self, tenant, m):
+        """The m candidates of ``tenant`` with the largest counts as ``(item, count)``, largest first."""
+        run = self._run(tenant)
+        counts = self._counts[run]
+        order = np.argsort(-counts, kind="stable")[:m]
+        return list(zip(self._items[run][order].tolist(), counts[order].tolist()))
+
+    def count(self, tenant, item):
+        run = self._run(tenant)
+        items = self._items[run]
+        position = np.searchsorted(items, item)
+        if position < len(items) and items[position] == item:
+            return int(self._counts[run][position])
+        return 0
+
+    def estimate(self, tenant, item):
+        """Bounds ``(lower, upper)`` on the count of ``item`` for ``tenant``."""
+        lower = self.count(tenant, item)
+        return lower, lower + self.decrements(tenant)
+
+    def k(self, tenant):
+        slot = self._slot(tenant)
+        return 0 if slot is None else int(self._k[slot])
+
+    def n(self, tenant):
+        slot = self._slot(tenant)
+        return 0 if slot is None else int(self._n[slot])
+
+    def decrements(self, tenant):
+        slot = self._slot(tenant)
+        return 0 if slot is None else int(self._decrements[slot])
+
+    def tenants(self):
+        """Ids of the tenants that have seen any items, in increasing order."""
+        self._flush()
+        return sorted(self._slots)
+
+    @property
+    def nbytes(self):
+        """Size of the counter arena, the part bounded by ``max_bytes``."""
+        return self._items.nbytes + self._counts.nbytes
+
+    def __len__(self):
+        self._flush()
+        return int(self._size.sum())
+
+    def __repr__(self):
+        return "MultiFrequent(capacity=%d, tenants=%d, counters=%d)" % (self.capacity, len(self.tenants()), len(self))
+
+
+def _aggregate(tenants, items, counts):
+    """Sort the pairs by tenant and item and sum the counts of equal ones."""
+    order = np.lexsort((items, tenants))
+    tenants, items, counts = tenants[order], items[order], counts[order]
+    starts = np.flatnonzero(np.concatenate([[True], (tenants[1:] != tenants[:-1]) | (items[1:] != items[:-1])]))
+    return tenants[starts], items[starts], np.add.reduceat(counts, starts)
+
+
+def _search(values, lo, hi, keys):
+    """The first position in each ``values[lo:hi]`` whose value is not below its key."""
+    lo, hi = lo.copy(), hi.copy()
+    last = len(values) - 1
+    while True:
+        active = lo < hi
+        if not active.any():
+            return lo
+        middle = (lo + hi) >> 1
+        below = active & (values[np.minimum(middle, last)] < keys)
+        lo = np.where(below, middle + 1, lo)
+        hi = np.where(active & ~below, middle, hi)
+
+
+def _cuts(counts, lengths, ks):
+    """The (k+1)-th largest count of each group of ``lengths`` consecutive counts, 0 if it has at most k."""
+    cut = np.zeros(len(lengths), dtype=np.int64)
+    over = np.flatnonzero(lengths > ks)
+    if not len(over):
+        return cut
+    begin = np.cumsum(lengths) - lengths
+    # Large groups are cut one at a time in linear time, small ones ranked all together.
+    large = over[lengths[over] > LARGE]
+    for group in large.tolist():
+        values = counts[begin[group]:begin[group] + lengths[group]]
+        cut[group] = np.partition(values, len(values) - ks[group] - 1)[len(values) - ks[group] - 1]
+    small = over[lengths[over] <= LARGE]
+    if len(small):
+        sizes = lengths[small]
+        rows = np.repeat(begin[small] - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+        group = np.repeat(np.arange(len(small)), sizes)
+        order = np.lexsort((-counts[rows], group))
+        at = (np.cumsum(sizes) - sizes) + ks[small]
+        cut[small] = counts[rows][order][at]
+    return cut
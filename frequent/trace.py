@@ -0,0 +1,130 @@
+"""Opt-in execution traces of Frequent summaries.
+
+Tracing a summary shadows its ``update``, ``update_batch``, ``merge``,
+``_increment``, ``_insert_group`` and ``_unlink`` methods on that one
+instance, the same way instrumentation does, and records what each update
+did to the groups and counters as a list of plain tuples:
+
+    ("layout", groups)                      the whole structure: a list of
+                                            (group, diff, [(counter, item), ...])
+                                            smallest group first, item None if empty
+    ("update", item, weight)                an update starts; the events up to the
+                                            next one are what it did
+    ("decrement", amount)                   the first group's diff went down by amount,
+                                            decrementing every counter
+    ("insert", item, counter, old)          item took over counter from old (None if empty)
+    ("split", group, after, diff)           a group with diff was created after group
+                                            ``after``; the diff of the one behind it
+                                            went down by diff
+    ("increment", item, counter, source, target)
+                                            counter moved from group source to target
+    ("merge", group)                        the emptied group was removed and its diff
+                                            added to the next group
+
+Counters and groups are numbered in order of appearance. Batch updates and
+merges are recorded as a single new layout of the structure they leave.
+Only summaries built from linked nodes (Frequent and SpaceSaving) can be
+traced, and not while they are instrumented: both shadow the same methods.
+"""
+
+
+class Trace:
+    """The events recorded from one summary, oldest first, in ``events``."""
+
+    def __init__(self):
+        self.events = []
+        self._counters = {}
+        self._groups = {}
+
+    def counter(self, counter):
+        return self._counters.setdefault(counter, len(self._counters))
+
+    def group(self, group):
+        return self._groups.setdefault(group, len(self._groups))
+
+    def layout(self, summary):
+        """Record the current structure, numbering everything afresh."""
+        self._counters.clear()
+        self._groups.clear()
+        groups = []
+        group = summary._head
+        while group is not None:
+            # Counters of a zero group are free even if they still hold an item.
+            empty = group is summary._head and not group.diff
+            counters = []
+            counter = group.first
+            while counter is not None:
+                counters.append((self.counter(counter), None if empty or counter.item not in summary._index else counter.item))
+                counter = counter.next
+            groups.append((self.group(group), group.diff, counters))
+            group = group.next
+        self.events.append(("layout", groups))
+
+
+def attach(summary, trace):
+    if not hasattr(summary._head, "first"):
+        raise TypeError("only summaries built from linked nodes can be traced")
+    if "metrics" in summary.__dict__:
+        raise RuntimeError("the summary is instrumented; call uninstrument() before tracing it")
+    cls = type(summary)
+    events = trace.events
+
+    def update(item, weight=1):
+        events.append(("update", item, weight))
+        start = len(events)
+        decrements = summary.decrements
+        taken = summary._head.first if item not in summary._index else None
+        old = taken.item if taken is not None and taken.item in summary._index else None
+        cls.update(summary, item, weight)
+        recorded = []
+        if summary.decrements != decrements:
+            recorded.append(("decrement", summary.decrements - decrements))
+        if taken is not None and taken.item == item and item in summary._index:
+            recorded.append(("insert", item, trace.counter(taken), old))
+        events[start:start] = recorded
+
+    def rebuild(method):
+        def rebuilt(*args, **kwargs):
+            start = len(events)
+            result = method(summary, *args, **kwargs)
+            del events[start:]
+            trace.layout(summary)
+            return result
+        return rebuilt
+
+    def increment(counter, weight):
+        source = trace.group(counter.group)
+        start = len(events)
+        cls._increment(summary, counter, weight)
+        # Report the groups created for the counter before it moves and the
+        # group it left behind after.
+        inner = events[start:]
+        del events[start:]
+        events.extend(event for event in inner if event[0] != "merge")
+        events.append(("increment", counter.item, trace.counter(counter), source, trace.group(counter.group)))
+        events.extend(event for event in inner if event[0] == "merge")
+
+    def insert_group(diff, after):
+        group = cls._insert_group(summary, diff, after)
+        events.append(("split", trace.group(group), trace.group(after), diff))
+        return group
+
+    def unlink(group):
+        events.append(("merge", trace.group(group)))
+        return cls._unlink(summary, group)
+
+    summary.update = update
+    summary.update_batch = rebuild(cls.update_batch)
+    summary.merge = rebuild(cls.merge)
+    summary._increment = increment
+    summary._insert_group = insert_group
+    summary._unlink = unlink
+    summary.tracing = trace
+    trace.layout(summary)
+
+
+def detach(summary):
+    if "tracing" not in summary.__dict__:
+        return
+    for name in ("update", "update_batch", "merge", "_increment", "_insert_group", "_unlink", "tracing"):
+        summary.__dict__.pop(name, None)
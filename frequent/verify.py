@@ -0,0 +1,58 @@
+"""Second pass over a replayable stream to get exact counts of the candidates.
+
+The candidates of a Frequent summary may include false positives. Counting
+just those (at most k) items over the stream again removes them: only the
+items occurring more than n/(k+1) times are kept.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def _tally(keys, batches):
+    totals = np.zeros(len(keys), dtype=np.int64)
+    n = 0
+    for batch in batches:
+        n += batch.size
+        if not len(keys):
+            continue
+        # Sorted-array lookup: a candidate's slot is where it would be inserted.
+        slots = np.searchsorted(keys, batch)
+        slots[slots == len(keys)] = 0
+        hit = keys[slots] == batch
+        totals += np.bincount(slots[hit], minlength=len(keys))
+    return n, totals
+
+
+def _tally_range(keys, path, dtype, start, stop, chunk):
+    ids = np.memmap(path, dtype=dtype, mode="r")
+    return _tally(keys, (ids[offset:min(offset + chunk, stop)] for offset in range(start, stop, chunk)))
+
+
+def exact_counts(candidates, batches):
+    """Return ``(n, counts)`` with the exact count of every candidate in ``batches``."""
+    keys = np.sort(np.asarray(list(candidates)))
+    n, totals = _tally(keys, batches)
+    return n, dict(zip(keys.tolist(), totals.tolist()))
+
+
+def exact_counts_file(candidates, path, dtype="<i8", workers=None, chunk=1 << 22):
+    """Like ``exact_counts`` over a raw binary ID file, split across processes."""
+    keys = np.sort(np.asarray(list(candidates), dtype=dtype))
+    workers = workers or os.cpu_count() or 1
+    length = os.path.getsize(path) // np.dtype(dtype).itemsize
+    bounds = np.linspace(0, length, workers + 1).astype(np.int64).tolist()
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_tally_range, keys, os.fspath(path), dtype, start, stop, chunk)
+                   for start, stop in zip(bounds, bounds[1:])]
+        parts = [future.result() for future in futures]
+    n = sum(part_n for part_n, _ in parts)
+    totals = sum(part_totals for _, part_totals in parts)
+    return n, dict(zip(keys.tolist(), np.asarray(totals).tolist()))
+
+
+def heavy_hitters(k, n, counts):
+    """Keep the exactly counted items occurring more than n/(k+1) times."""
+    return {item: count for item, count in counts.items() if count * (k + 1) > n}
@@ -0,0 +1,132 @@
+"""Heavy hitters over recent items: sliding windows and exponential decay.
+
+Both variants cut the stream into blocks, keep one Frequent summary per
+block and combine the blocks that are still relevant when queried. Updates
+only touch the newest block, so they stay O(1) amortized, and memory is
+bounded by the number of live blocks times k counters.
+
+Error bounds, extending the n/(k+1) argument of the plain algorithm:
+
+* ``WindowedFrequent`` with a window of N items and B blocks answers over
+  the blocks overlapping the window, which hold the last W items with
+  N <= W < N + N/B. Each block summary undercounts an item by at most
+  n_b/(k+1) and merging keeps the sum of those errors, so a reported count
+  lies between (count in the window) - W/(k+1) and (count in the window)
+  + N/B, the latter being the expired part of the oldest block. Every
+  item occurring more than W/(k+1) times in the window, in particular
+  every item above N(1 + 1/B)/(k+1), is reported. For a window of T
+  seconds the same holds with N and W the number of items that arrived
+  in the window and in the blocks overlapping it.
+
+* ``DecayedFrequent`` weighs the block of age a by 2^(-a/half_life). With
+  D the decayed total of all items, the decayed sum of the per-block
+  errors is at most D/(k+1), so every item whose decayed count exceeds
+  D/(k+1) is reported. Decaying per block rather than per item costs at
+  most a factor 2^(block/half_life) on the weight of an item.
+"""
+
+from collections import deque
+
+from .cut import cut_counts
+from .engine import Frequent
+
+
+class _Blocks:
+    def __init__(self, k, block, clock, factory):
+        if block <= 0:
+            raise ValueError("block length must be positive")
+        self.k = k
+        self.block = block
+        self.clock = clock
+        self.factory = factory
+        self.n = 0
+        # (number, summary) pairs, oldest first. Block number b covers the
+        # items (or times) from b * block up to (b + 1) * block.
+        self._blocks = deque()
+        self._position = 0
+
+    def _now(self):
+        return self.clock() if self.clock is not None else self._position
+
+    def _current(self, now):
+        number = int(now // self.block)
+        if not self._blocks or self._blocks[-1][0] != number:
+            self._blocks.append((number, self.factory(self.k)))
+            self._expire(now)
+        return self._blocks[-1][1]
+
+    def update(self, item, weight=1):
+        now = self._now()
+        self._current(now).update(item, weight)
+        self._position += weight
+        self.n += weight
+
+    def extend(self, stream):
+        update = self.update
+        for item in stream:
+            update(item)
+
+    def candidates(self):
+        return list(self.counts())
+
+
+class WindowedFrequent(_Blocks):
+    """Frequent over the last ``window`` items, or the last ``window`` seconds with a clock.
+
+    Pass ``clock=time.monotonic`` (or any callable returning the current
+    time) for a time-based window; without a clock the window counts items.
+    """
+
+    def __init__(self, k, window, blocks=8, clock=None, factory=Frequent):
+        super().__init__(k, window / blocks, clock, factory)
+        self.window = window
+
+    def _expire(self, now):
+        # Keep the oldest block while any part of it is inside the window.
+        while self._blocks and (self._blocks[0][0] + 1) * self.block <= now - self.window:
+            self._blocks.popleft()
+
+    def summary(self):
+        """A Frequent summary of the blocks overlapping the window."""
+        self._expire(self._now())
+        merged = self.factory(self.k)
+        for _, block in self._blocks:
+            merged.merge(block)
+        return merged
+
+    def counts(self):
+        return self.summary().counts()
+
+
+class DecayedFrequent(_Blocks):
+    """Frequent with exponentially decayed counts.
+
+    An item seen ``half_life`` items (or seconds, with a clock) ago counts
+    half as much as one seen now. Blocks whose weight drops below
+    ``min_weight`` are discarded, which bounds memory to about
+    ``half_life * log2(1 / min_weight) / block`` summaries.
+    """
+
+    def __init__(self, k, half_life, block=None, clock=None, min_weight=2.0 ** -20, factory=Frequent):
+        super().__init__(k, block or half_life / 8, clock, factory)
+        self.half_life = half_life
+        self.min_weight = min_weight
+
+    def _weight(self, number, now):
+        age = max(now - (number + 1) * self.block, 0)
+        return 0.5 ** (age / self.half_life)
+
+    def _expire(self, now):
+        while self._blocks and self._weight(self._blocks[0][0], now) < self.min_weight:
+            self._blocks.popleft()
+
+    def counts(self):
+        """Decayed ``{item: count}`` estimates for at most k candidates."""
+        now = self._now()
+        self._expire(now)
+        counts = {}
+        for number, block in self._blocks:
+            weight = self._weight(number, now)
+            for item, count in block.items():
+                counts[item] = counts.get(item, 0) + weight * count
+        return cut_counts(counts, self.k)[0]
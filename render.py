@@ -0,0 +1,79 @@
+"""Render the video's sections in parallel and join them without re-encoding.
+
+    python render.py -q h --workers 4
+
+Every section of scene.py is rendered by its own manim process, at most
+``--workers`` at a time, and the partial videos are concatenated with
+ffmpeg's concat demuxer and ``-c copy``. All sections share one quality
+setting, so their streams are identical in format and can be joined as is.
+
+RecorderService asks for each recording interactively: record the
+voiceovers once with ``--workers 1`` (or render CreateFrequent directly),
+after which they come from the cache and sections can render side by side.
+
+``--preview`` renders small, low frame rate drafts with silent, estimated
+voiceover timings (FREQUENT_PREVIEW in scene.py); name a section to preview
+just that one, e.g. ``python render.py --preview Proof``.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from scene import SECTIONS
+
+HERE = Path(__file__).resolve().parent
+
+
+def render_section(name, quality, media_dir, preview=False):
+    """Render one section with manim and return the path of its video."""
+    command = [sys.executable, "-m", "manim", "render", "-q", quality, "--media_dir", str(media_dir), str(HERE / "scene.py"), name]
+    env = dict(os.environ, FREQUENT_PREVIEW="1") if preview else None
+    subprocess.run(command, check=True, cwd=HERE, env=env)
+    videos = sorted((media_dir / "videos").glob("*/*/%s.mp4" % name), key=os.path.getmtime)
+    if not videos:
+        raise RuntimeError("manim produced no video for %s" % name)
+    return videos[-1]
+
+
+def concat(videos, output):
+    """Join videos with the same streams by copying them, not re-encoding."""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for video in videos:
+            listing.write("file '%s'\n" % Path(video).resolve())
+    try:
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", listing.name, "-c", "copy", str(output)], check=True)
+    finally:
+        os.unlink(listing.name)
+
+
+def main(argv=None):
+    names = [scene.__name__ for scene in SECTIONS]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sections", nargs="*", metavar="section", help="sections to render, in order (default: all of %s)" % ", ".join(names))
+    parser.add_argument("-q", "--quality", choices="lmhpk", default="h", help="manim quality flag")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="sections rendered at once")
+    parser.add_argument("--media-dir", type=Path, default=HERE / "media")
+    parser.add_argument("--preview", action="store_true", help="quick low resolution draft with silent voiceovers")
+    parser.add_argument("-o", "--output", type=Path)
+    args = parser.parse_args(argv)
+    unknown = set(args.sections) - set(names)
+    if unknown:
+        parser.error("unknown section: %s" % ", ".join(sorted(unknown)))
+    sections = args.sections or names
+    output = args.output or HERE / ("preview.mp4" if args.preview else "frequent.mp4")
+
+    # Each worker only waits on its manim process, so threads are enough to
+    # keep one render per core going.
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        videos = list(pool.map(lambda name: render_section(name, args.quality, args.media_dir, args.preview), sections))
+    concat(videos, output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Animate an actual run of the Frequent engine, for any stream and any k.
+
+    FREQUENT_STREAM=blue,green,orange,blue,blue,green,purple FREQUENT_K=3 manim -ql replay.py ReplayFrequent
+
+The engine records what each update does to its groups (frequent/trace.py)
+and every update becomes a single animation: the item drops in, counters
+move to their new groups, groups appear, disappear or are relabelled. Boxes,
+labels, balls and arrows are copies of templates built once, so each update
+costs the same however long the stream is.
+"""
+
+import os
+
+import numpy as np
+from manim import *
+
+from frequent import Frequent
+from scene_cache import enable_tex_cache
+
+enable_tex_cache()
+
+PALETTE = [BLUE, GREEN, ORANGE, PURPLE, RED, YELLOW, TEAL, PINK, MAROON, GOLD]
+GROUP_Y = 1.5
+DROP_Y = 3.3
+
+
+class Templates:
+    """Mobjects built once and handed out as copies."""
+
+    def __init__(self):
+        self._groups = {}
+        self._balls = {}
+        self._colors = {}
+        self.cross = Cross(scale_factor=0.4)
+        self.box = SurroundingRectangle(self.cross, buff=0.2, color=WHITE)
+        self.arrow = Arrow(LEFT, RIGHT, buff=0.1, color=WHITE, max_tip_length_to_length_ratio=0.15)
+
+    def group(self, text):
+        if text not in self._groups:
+            label = MathTex(text)
+            self._groups[text] = VGroup(label, SurroundingRectangle(label, corner_radius=0.5, buff=0.5, color=WHITE)).scale(0.8)
+        return self._groups[text].copy()
+
+    def ball(self, item):
+        color = self._colors.setdefault(item, PALETTE[len(self._colors) % len(PALETTE)])
+        if color not in self._balls:
+            self._balls[color] = Circle(radius=0.35, color=color, fill_opacity=1)
+        return self._balls[color].copy()
+
+    def content(self, item):
+        return self.cross.copy() if item is None else self.ball(item)
+
+    def counter(self, item):
+        return VGroup(self.box.copy(), self.content(item))
+
+    def link(self, start, end):
+        return self.arrow.copy().put_start_and_end_on(start, end)
+
+
+class _Replay:
+    """Mirrors the traced structure and turns each step into one animation."""
+
+    def __init__(self, templates):
+        self.templates = templates
+        self.order = []
+        self.diffs = {}
+        self.members = {}
+        self.content = {}
+        self.groups = {}
+        self.counters = {}
+        self.shown = {}
+        self.links = []
+
+    def _text(self, group):
+        if group == self.order[0]:
+            return r"\text{Value}=%d" % self.diffs[group]
+        return r"\text{Diff}=%d" % self.diffs[group]
+
+    def _visible(self, counter, group):
+        return None if group == self.order[0] and not self.diffs[group] else self.content[counter]
+
+    def _places(self):
+        """Where each group and counter belongs in the current structure."""
+        spacing = min(2.5, (config.frame_width - 1) / len(self.order))
+        tallest = max(len(members) for members in self.members.values())
+        step = min(0.9, 4.5 / max(tallest, 1))
+        places = {}
+        for position, group in enumerate(self.order):
+            x = (position - (len(self.order) - 1) / 2) * spacing
+            places[group] = np.array([x, GROUP_Y, 0])
+            for row, counter in enumerate(self.members[group]):
+                places[("counter", counter)] = np.array([x, GROUP_Y - 1.3 - row * step, 0])
+        return places
+
+    def _links(self, places):
+        """Reuse the existing arrows between neighbouring groups, adding or dropping the difference."""
+        animations = []
+        wanted = len(self.order) - 1
+        for position in range(wanted):
+            start = places[self.order[position]] + RIGHT * 0.9
+            end = places[self.order[position + 1]] + LEFT * 0.9
+            if position < len(self.links):
+                link = self.links[position]
+                link.generate_target()
+                link.target.put_start_and_end_on(start, end)
+                animations.append(MoveToTarget(link))
+            else:
+                link = self.templates.link(start, end)
+                self.links.append(link)
+                animations.append(FadeIn(link))
+        animations.extend(FadeOut(link) for link in self.links[wanted:])
+        del self.links[wanted:]
+        return animations
+
+    def layout(self, groups):
+        leaving = [FadeOut(mobject) for mobject in list(self.groups.values()) + list(self.counters.values()) + self.links]
+        self.links = []
+        self.order = [group for group, _, _ in groups]
+        self.diffs = {group: diff for group, diff, _ in groups}
+        self.members = {group: [counter for counter, _ in counters] for group, _, counters in groups}
+        self.content = {counter: item for _, _, counters in groups for counter, item in counters}
+        places = self._places()
+        self.groups = {group: self.templates.group(self._text(group)).move_to(places[group]) for group in self.order}
+        self.counters, self.shown = {}, {}
+        for group in self.order:
+            for counter in self.members[group]:
+                self.shown[counter] = self._visible(counter, group)
+                self.counters[counter] = self.templates.counter(self.shown[counter]).move_to(places[("counter", counter)])
+        arriving = [FadeIn(mobject) for mobject in list(self.groups.values()) + list(self.counters.values())]
+        arriving.extend(self._links(places))
+        return Succession(AnimationGroup(*leaving), AnimationGroup(*arriving)) if leaving else AnimationGroup(*arriving)
+
+    def update(self, item, weight, events):
+        texts = {group: self._text(group) for group in self.order}
+        removed = []
+        landing = None
+        for event in events:
+            kind = event[0]
+            if kind == "decrement":
+                self.diffs[self.order[0]] -= event[1]
+            elif kind == "insert":
+                self.content[event[2]] = event[1]
+            elif kind == "split":
+                _, group, after, diff = event
+                position = self.order.index(after) + 1
+                if position < len(self.order):
+                    self.diffs[self.order[position]] -= diff
+                self.order.insert(position, group)
+                self.diffs[group] = diff
+                self.members[group] = []
+            elif kind == "increment":
+                _, _, counter, source, target = event
+                self.members[source].remove(counter)
+                self.members[target].append(counter)
+                self.content[counter] = event[1]
+                landing = counter
+            elif kind == "merge":
+                group = event[1]
+                position = self.order.index(group)
+                if position + 1 < len(self.order):
+                    self.diffs[self.order[position + 1]] += self.diffs[group]
+                self.order.pop(position)
+                del self.diffs[group]
+                del self.members[group]
+                removed.append(self.groups.pop(group))
+
+        places = self._places()
+        changes = [FadeOut(mobject) for mobject in removed]
+        for group in self.order:
+            text = self._text(group)
+            if group not in self.groups:
+                self.groups[group] = self.templates.group(text).move_to(places[group])
+                changes.append(FadeIn(self.groups[group]))
+                continue
+            mobject = self.groups[group]
+            if text != texts[group]:
+                mobject.target = self.templates.group(text).move_to(places[group])
+            else:
+                mobject.generate_target()
+                mobject.target.move_to(places[group])
+            changes.append(MoveToTarget(mobject))
+        for group in self.order:
+            for counter in self.members[group]:
+                changes.append(self._move_counter(counter, group, places))
+        changes.extend(self._links(places))
+
+        ball = self.templates.ball(item).move_to([0, DROP_Y, 0])
+        if landing is not None:
+            ball.generate_target()
+            ball.target.move_to(places[("counter", landing)])
+            changes.append(MoveToTarget(ball, remover=True))
+        else:
+            changes.append(FadeOut(ball))
+        return Succession(FadeIn(ball, shift=DOWN), AnimationGroup(*changes))
+
+    def _move_counter(self, counter, group, places):
+        mobject = self.counters[counter]
+        visible = self._visible(counter, group)
+        mobject.generate_target()
+        mobject.target.move_to(places[("counter", counter)])
+        if visible != self.shown[counter]:
+            mobject.target.submobjects[1] = self.templates.content(visible).move_to(mobject.target[0])
+            self.shown[counter] = visible
+        return MoveToTarget(mobject)
+
+
+def animate_trace(trace, templates=None):
+    """Yield one animation per recorded layout and per update."""
+    replay = _Replay(templates or Templates())
+    update = None
+    for event in trace.events:
+        if event[0] in ("layout", "update") and update is not None:
+            yield replay.update(*update)
+            update = None
+        if event[0] == "layout":
+            yield replay.layout(event[1])
+        elif event[0] == "update":
+            update = (event[1], event[2], [])
+        else:
+            update[2].append(event)
+    if update is not None:
+        yield replay.update(*update)
+
+
+class ReplayFrequent(Scene):
+    def construct(self):
+        stream = os.environ.get("FREQUENT_STREAM", "blue,green,orange,blue,blue,green,purple").split(",")
+        summary = Frequent(int(os.environ.get("FREQUENT_K", 3)))
+        trace = summary.trace()
+        summary.extend(stream)
+        for animation in animate_trace(trace):
+            self.play(animation)
+        self.wait(1)
@@ -1,8 +1,15 @@
+import os
+from contextlib import contextmanager
+
 from manim import *
 from manim_voiceover import VoiceoverScene
 from manim_voiceover.services.gtts import GTTSService
 from manim_voiceover.services.recorder import RecorderService
 
+from scene_cache import cached_speech_service, enable_tex_cache
+
+enable_tex_cache()
+
 BUCKET_X = {
     1: -5,
     2: -2,
@@ -12,10 +19,53 @@ BUCKET_Y = -3
 
 STREAM = [BLUE, GREEN, ORANGE, BLUE, BLUE, GREEN, PURPLE]
 
-class CreateFrequent(VoiceoverScene):
-    def construct(self):
-        # self.set_speech_service(GTTSService(lang="en", tld="com"))
-        self.set_speech_service(RecorderService())
+# FREQUENT_PREVIEW=1 renders a quick draft: small frames at a low frame rate
+# and silence in place of every voiceover, timed from its length in words.
+# FREQUENT_SECTION=<name> makes CreateFrequent render only that section.
+PREVIEW = os.environ.get("FREQUENT_PREVIEW") == "1"
+SECTION = os.environ.get("FREQUENT_SECTION")
+WORDS_PER_SECOND = 2.5
+
+if PREVIEW:
+    config.pixel_width = 640
+    config.pixel_height = 360
+    config.frame_rate = 10
+
+class PlaceholderTracker:
+    """Stands in for a voiceover tracker in previews; nothing is recorded or played."""
+
+    def __init__(self, scene, text):
+        self.scene = scene
+        self.start = scene.renderer.time
+        self.duration = max(1, len(text.split()) / WORDS_PER_SECOND)
+
+    def get_remaining_duration(self, buff=0):
+        return max(self.duration - (self.scene.renderer.time - self.start) + buff, 0)
+
+class FrequentScene(VoiceoverScene):
+    def setup(self):
+        super().setup()
+        self.templates = {}
+        if PREVIEW:
+            return
+        # self.set_speech_service(cached_speech_service(GTTSService(lang="en", tld="com")))
+        self.set_speech_service(cached_speech_service(RecorderService()))
+
+    def voiceover(self, text=None, **kwargs):
+        if PREVIEW:
+            return self.silent_voiceover(text)
+        return super().voiceover(text=text, **kwargs)
+
+    @contextmanager
+    def silent_voiceover(self, text):
+        tracker = PlaceholderTracker(self, text)
+        yield tracker
+        remaining = tracker.get_remaining_duration()
+        if remaining:
+            self.wait(remaining)
+
+    def intro(self):
+        """Title, history and the heavy hitters problem."""
         title = Tex(
                 r'The \emph{Frequent} Algorithm',
                 font_size=64,
@@ -59,7 +109,9 @@ class CreateFrequent(VoiceoverScene):
             one_pass.next_to(limited_memory, DOWN)
             self.play(Create(one_pass))
         self.play(Uncreate(data_stream_definition), Uncreate(data_stream_definition_2), Uncreate(limited_memory), Uncreate(one_pass)) 
-        
+
+    def buckets(self):
+        """The bucket version of the algorithm on the example stream."""
         with self.voiceover(text="""The algorithm is beautiful in its simplicity and works as follows.""") as tracker:
             bucket_1 = self.make_bucket()
             bucket_1.move_to([BUCKET_X[1],BUCKET_Y,0])
@@ -166,7 +218,9 @@ class CreateFrequent(VoiceoverScene):
         
         with self.voiceover("Let us prove that this is always the case."):
             self.play(Uncreate(n_brace), Uncreate(k_brace), Uncreate(stream_text), Uncreate(candidates_text), Uncreate(stream_group), Uncreate(candidates), Uncreate(blues_brace), Uncreate(blues_text_1), Uncreate(blues_text_4))
-         
+
+    def proof(self):
+        """Why every heavy hitter ends up a candidate."""
         with self.voiceover("""Let $x$ be an element which occurs more than $n/(k+1)$ times, where t denotes its count. Let us prove that $x$
                             will always be a candidate at the end of the stream."""):
             x = MathTex(r"x", font_size = 48)
@@ -241,6 +295,9 @@ class CreateFrequent(VoiceoverScene):
             d_less_than_i = MathTex(r"\therefore d < i").next_to(inequality1, DOWN * 5)
             self.play(Create(d_less_than_i))
         self.play(Uncreate(contradiction), Uncreate(inequality1), Uncreate(inequality2), Uncreate(d_less_than_i))
+
+    def grouped_counters(self):
+        """The constant time implementation with grouped counters."""
         with self.voiceover("""Now, I have been purposefully vague about the implementation. Due to the nature of data streams, we usually have very little time to process each element.
                             This means that operations such as decrementing the counter of every bucket should ideally be done in constant time. Fortunately, Demaine et al. provide 
                             a data structure that can achieve this for us. It consists of maintaining groups of counters, where each group is associated with a count value and are connected together
@@ -248,55 +305,43 @@ class CreateFrequent(VoiceoverScene):
                             This is known as a differential encoding."""):
             self.wait(15)
             
-            first_group_text = MathTex(r"\text{Value}=0")
-            first_group_rec = SurroundingRectangle(first_group_text, corner_radius=0.5, buff=0.5, color=WHITE)
-            first_group = VGroup(first_group_text, first_group_rec).scale(0.8)
+            first_group = self.make_group(r"\text{Value}=0")
+            first_group_rec = first_group[1]
             
 
-            counter_1_cross = Cross(scale_factor=0.4)
-            counter_1_rec = SurroundingRectangle(counter_1_cross, buff=0.2, color=WHITE)
+            counter_1 = self.make_counter()
+            counter_1_cross, counter_1_rec = counter_1
             
-            counter_2_cross = Cross(scale_factor=0.4)
-            counter_2_rec = SurroundingRectangle(counter_2_cross, buff=0.2, color=WHITE)
+            counter_2 = self.make_counter()
+            counter_2_cross, counter_2_rec = counter_2
             
-            counter_3_cross = Cross(scale_factor=0.4)
-            counter_3_rec = SurroundingRectangle(counter_3_cross, buff=0.2, color=WHITE)
+            counter_3 = self.make_counter()
+            counter_3_cross, counter_3_rec = counter_3
 
 
-            counter_1 = VGroup(counter_1_cross, counter_1_rec)
             counter_1.next_to(first_group, DOWN*3+LEFT)
-            counter_2 = VGroup(counter_2_cross, counter_2_rec)
             counter_2.next_to(first_group, DOWN*3)
-            counter_3 = VGroup(counter_3_cross, counter_3_rec)
             counter_3.next_to(first_group, DOWN*3+RIGHT)
             
-            counter_1_next_arrow = CurvedArrow(start_point=counter_1_rec.get_right(), end_point=counter_2_rec.get_left(), angle=-PI/2, color=WHITE)
-            counter_1_next_arrow.tip.height = 0.3
+            counter_1_next_arrow = self.make_arrow(counter_1_rec.get_right(), counter_2_rec.get_left(), -PI/2)
             counter_1.add(counter_1_next_arrow)
-            counter_2_prev_arrow = CurvedArrow(start_point=counter_2_rec.get_left(), end_point=counter_1_rec.get_right(), angle=-PI/2, color=WHITE)
-            counter_2_prev_arrow.tip.height = 0.3
-            counter_2_next_arrow = CurvedArrow(start_point=counter_2_rec.get_right(), end_point=counter_3_rec.get_left(), angle=-PI/2, color=WHITE)
-            counter_2_next_arrow.tip.height = 0.3
+            counter_2_prev_arrow = self.make_arrow(counter_2_rec.get_left(), counter_1_rec.get_right(), -PI/2)
+            counter_2_next_arrow = self.make_arrow(counter_2_rec.get_right(), counter_3_rec.get_left(), -PI/2)
             
             counter_2.add(counter_2_prev_arrow, counter_2_next_arrow)
             counter_2.add(counter_2_prev_arrow)
 
-            counter_3_prev_arrow = CurvedArrow(start_point=counter_3_rec.get_left(), end_point=counter_2_rec.get_right(), angle=-PI/2, color=WHITE)
-            counter_3_prev_arrow.tip.height = 0.3
+            counter_3_prev_arrow = self.make_arrow(counter_3_rec.get_left(), counter_2_rec.get_right(), -PI/2)
             counter_3.add(counter_3_prev_arrow)
 
-            counter_1_group_arrow = CurvedArrow(start_point=counter_1_rec.get_top(), end_point=first_group_rec.get_corner(DL)+UP*0.1+RIGHT*0.1, angle=-PI/2, color=WHITE)
-            counter_1_group_arrow.tip.height = 0.3
+            counter_1_group_arrow = self.make_arrow(counter_1_rec.get_top(), first_group_rec.get_corner(DL)+UP*0.1+RIGHT*0.1, -PI/2)
             counter_1.add(counter_1_group_arrow)
-            counter_2_group_arrow = CurvedArrow(start_point=counter_2_rec.get_top(), end_point=first_group_rec.get_bottom(), angle=0, color=WHITE)
-            counter_2_group_arrow.tip.height = 0.3
+            counter_2_group_arrow = self.make_arrow(counter_2_rec.get_top(), first_group_rec.get_bottom(), 0)
             counter_2.add(counter_2_group_arrow)
-            counter_3_group_arrow = CurvedArrow(start_point=counter_3_rec.get_top(), end_point=first_group_rec.get_corner(DR)+UP*0.1+LEFT*0.1, angle=PI/2, color=WHITE)
-            counter_3_group_arrow.tip.height = 0.3
+            counter_3_group_arrow = self.make_arrow(counter_3_rec.get_top(), first_group_rec.get_corner(DR)+UP*0.1+LEFT*0.1, PI/2)
             counter_3.add(counter_3_group_arrow)
 
-            first_group_arrow_down = CurvedArrow(start_point=first_group_rec.get_corner(DL)+UP*0.1+RIGHT*0.1, end_point=counter_1_rec.get_top(), angle=0, color=WHITE)
-            first_group_arrow_down.tip.height = 0.3
+            first_group_arrow_down = self.make_arrow(first_group_rec.get_corner(DL)+UP*0.1+RIGHT*0.1, counter_1_rec.get_top(), 0)
             first_group.add(first_group_arrow_down)
 
             first_group.add(counter_1, counter_2, counter_3)
@@ -320,35 +365,29 @@ class CreateFrequent(VoiceoverScene):
             self.wait(8)
             # counter_1.add(ball_1)
             #### splitting first group ####
-            second_group_text = MathTex(r"\text{Diff}=1")
-            second_group_rec = SurroundingRectangle(second_group_text, corner_radius=0.5, buff=0.5, color=WHITE)
-            second_group = VGroup(second_group_text, second_group_rec).scale(0.8)
+            second_group = self.make_group(r"\text{Diff}=1")
+            second_group_rec = second_group[1]
             second_group.shift(RIGHT*2)
             second_group.add(counter_1)
             counter_1.remove(counter_1_next_arrow, counter_1_group_arrow)
             counter_1.next_to(second_group_rec, DOWN*3)
-            counter_1_group_arrow = CurvedArrow(start_point=counter_1_rec.get_top(), end_point=second_group_rec.get_bottom(), angle=PI/2, color=WHITE)
-            counter_1_group_arrow.tip.height = 0.3
+            counter_1_group_arrow = self.make_arrow(counter_1_rec.get_top(), second_group_rec.get_bottom(), PI/2)
             counter_1.add(counter_1_group_arrow)
-            second_group_arrow_down = CurvedArrow(start_point=second_group_rec.get_bottom(), end_point=counter_1_rec.get_top(), angle=PI/2, color=WHITE)
-            second_group_arrow_down.tip.height = 0.3
+            second_group_arrow_down = self.make_arrow(second_group_rec.get_bottom(), counter_1_rec.get_top(), PI/2)
             second_group.add(second_group_arrow_down)
             first_group.remove(counter_1)
 
             counter_2.shift(LEFT)
             counter_2.remove(counter_2_prev_arrow, counter_2_group_arrow)
-            counter_2_group_arrow = CurvedArrow(start_point=counter_2_rec.get_top(), end_point=first_group_rec.get_bottom(), angle=PI/4, color=WHITE)
-            counter_2_group_arrow.tip.height = 0.3
+            counter_2_group_arrow = self.make_arrow(counter_2_rec.get_top(), first_group_rec.get_bottom(), PI/4)
             counter_2.add(counter_2_group_arrow)
             counter_3.shift(LEFT)
             counter_3.remove(counter_3_group_arrow)
-            counter_3_group_arrow = CurvedArrow(start_point=counter_3_rec.get_top(), end_point=first_group_rec.get_bottom(), angle=0, color=WHITE)
-            counter_3_group_arrow.tip.height = 0.3
+            counter_3_group_arrow = self.make_arrow(counter_3_rec.get_top(), first_group_rec.get_bottom(), 0)
             counter_3.add(counter_3_group_arrow)
 
             first_group.remove(first_group_arrow_down)
-            first_group_arrow_down = CurvedArrow(start_point=first_group_rec.get_bottom(), end_point=counter_2_rec.get_top(), angle=PI/4, color=WHITE)
-            first_group_arrow_down.tip.height = 0.3
+            first_group_arrow_down = self.make_arrow(first_group_rec.get_bottom(), counter_2_rec.get_top(), PI/4)
             first_group.add(first_group_arrow_down)
             
 
@@ -362,12 +401,10 @@ class CreateFrequent(VoiceoverScene):
             )
 
 
-            first_group_next_arrow = CurvedArrow(start_point=first_group_rec.get_right(), end_point=second_group_rec.get_left(), angle=-PI/2, color=WHITE)
-            first_group_next_arrow.tip.height = 0.3
+            first_group_next_arrow = self.make_arrow(first_group_rec.get_right(), second_group_rec.get_left(), -PI/2)
             first_group.add(first_group_next_arrow)
 
-            second_group_prev_arrow = CurvedArrow(start_point=second_group_rec.get_left(), end_point=first_group_rec.get_right(), angle=-PI/2, color=WHITE)
-            second_group_prev_arrow.tip.height = 0.3
+            second_group_prev_arrow = self.make_arrow(second_group_rec.get_left(), first_group_rec.get_right(), -PI/2)
             second_group.add(second_group_prev_arrow)
 
             self.play(Create(first_group_next_arrow), Create(second_group_prev_arrow))
@@ -389,12 +426,10 @@ class CreateFrequent(VoiceoverScene):
 
             counter_3.remove(counter_3_prev_arrow, counter_3_group_arrow)
             counter_3.shift(LEFT)
-            counter_3_group_arrow = CurvedArrow(start_point=counter_3_rec.get_top(), end_point=first_group_rec.get_bottom(), angle=PI/2, color=WHITE)
-            counter_3_group_arrow.tip.height = 0.3
+            counter_3_group_arrow = self.make_arrow(counter_3_rec.get_top(), first_group_rec.get_bottom(), PI/2)
             counter_3.add(counter_3_group_arrow)
             first_group.remove(first_group_arrow_down)
-            first_group_arrow_down = CurvedArrow(start_point=first_group_rec.get_bottom(), end_point=counter_3_rec.get_top(), angle=PI/2, color=WHITE)
-            first_group_arrow_down.tip.height = 0.3
+            first_group_arrow_down = self.make_arrow(first_group_rec.get_bottom(), counter_3_rec.get_top(), PI/2)
             first_group.add(first_group_arrow_down)
             first_group.remove(counter_2)
             second_group.add(counter_2)
@@ -410,23 +445,18 @@ class CreateFrequent(VoiceoverScene):
 
 
             second_group.remove(second_group_arrow_down)
-            second_group_arrow_down = CurvedArrow(start_point=second_group_rec.get_bottom(), end_point=counter_2_rec.get_top(), angle=PI/4, color=WHITE)
-            second_group_arrow_down.tip.height = 0.3
+            second_group_arrow_down = self.make_arrow(second_group_rec.get_bottom(), counter_2_rec.get_top(), PI/4)
             second_group.add(second_group_arrow_down)
             counter_1.remove(counter_1_group_arrow)
-            counter_1_group_arrow = CurvedArrow(start_point=counter_1_rec.get_top(), end_point=second_group_rec.get_bottom(), angle=0, color=WHITE)
-            counter_1_group_arrow.tip.height = 0.3
+            counter_1_group_arrow = self.make_arrow(counter_1_rec.get_top(), second_group_rec.get_bottom(), 0)
             counter_1.add(counter_1_group_arrow)
 
-            counter_2_group_arrow = CurvedArrow(start_point=counter_2_rec.get_top(), end_point=second_group_rec.get_bottom(), angle=PI/4, color=WHITE)
-            counter_2_group_arrow.tip.height = 0.3
+            counter_2_group_arrow = self.make_arrow(counter_2_rec.get_top(), second_group_rec.get_bottom(), PI/4)
             counter_2.add(counter_2_group_arrow)
 
-            counter_2_next_arrow = CurvedArrow(start_point=counter_2_rec.get_right(), end_point=counter_1_rec.get_left(), angle=-PI/2, color=WHITE)
-            counter_2_next_arrow.tip.height = 0.3
+            counter_2_next_arrow = self.make_arrow(counter_2_rec.get_right(), counter_1_rec.get_left(), -PI/2)
             counter_2.add(counter_2_next_arrow)
-            counter_1_prev_arrow = CurvedArrow(start_point=counter_1_rec.get_left(), end_point=counter_2_rec.get_right(), angle=-PI/2, color=WHITE)
-            counter_1_prev_arrow.tip.height = 0.3
+            counter_1_prev_arrow = self.make_arrow(counter_1_rec.get_left(), counter_2_rec.get_right(), -PI/2)
             counter_1.add(counter_1_prev_arrow)
 
             self.play(Create(second_group_arrow_down), Create(counter_1_group_arrow), Create(counter_2_next_arrow), Create(counter_1_prev_arrow))
@@ -454,9 +484,8 @@ class CreateFrequent(VoiceoverScene):
             counter_2.remove(counter_2_group_arrow)
             counter_1.remove(counter_1_group_arrow)
             second_group.remove(second_group_arrow_down)
-            second_group_text_2 = MathTex(r"\text{Value}=1")
-            second_group_rec_2 = SurroundingRectangle(second_group_text_2, corner_radius=0.5, buff=0.5, color=WHITE)
-            second_group_2 = VGroup(second_group_text_2, second_group_rec_2).scale(0.8)
+            second_group_2 = self.make_group(r"\text{Value}=1")
+            second_group_rec_2 = second_group_2[1]
             second_group_2.add(counter_1, counter_2, counter_3)
             self.play(
                 ReplacementTransform(second_group, second_group_2),
@@ -467,26 +496,20 @@ class CreateFrequent(VoiceoverScene):
                 counter_1.animate.shift(RIGHT*1.45),
                 counter_3.animate.shift(RIGHT*1.45),
             )
-            counter_3_next_arrow = CurvedArrow(start_point=counter_3_rec.get_right(), end_point=counter_2_rec.get_left(), angle=-PI/2, color=WHITE)
-            counter_3_next_arrow.tip.height = 0.3
+            counter_3_next_arrow = self.make_arrow(counter_3_rec.get_right(), counter_2_rec.get_left(), -PI/2)
             counter_3.add(counter_3_next_arrow)
-            counter_2_prev_arrow = CurvedArrow(start_point=counter_2_rec.get_left(), end_point=counter_3_rec.get_right(), angle=-PI/2, color=WHITE)
-            counter_2_prev_arrow.tip.height = 0.3
+            counter_2_prev_arrow = self.make_arrow(counter_2_rec.get_left(), counter_3_rec.get_right(), -PI/2)
             counter_2.add(counter_2_prev_arrow)
 
-            second_group_2_arrow_down = CurvedArrow(start_point=second_group_rec_2.get_critical_point(DL)+UP*0.1+RIGHT*0.1, end_point=counter_3_rec.get_top(), angle=0, color=WHITE)
-            second_group_2_arrow_down.tip.height = 0.3
+            second_group_2_arrow_down = self.make_arrow(second_group_rec_2.get_critical_point(DL)+UP*0.1+RIGHT*0.1, counter_3_rec.get_top(), 0)
             second_group_2.add(second_group_2_arrow_down)
 
 
-            counter_3_group_arrow = CurvedArrow(start_point=counter_3_rec.get_top(), end_point=second_group_rec_2.get_critical_point(DL)+UP*0.1+RIGHT*0.1, angle=-PI/2, color=WHITE)
-            counter_3_group_arrow.tip.height = 0.3
+            counter_3_group_arrow = self.make_arrow(counter_3_rec.get_top(), second_group_rec_2.get_critical_point(DL)+UP*0.1+RIGHT*0.1, -PI/2)
             counter_3.add(counter_3_group_arrow)
-            counter_2_group_arrow = CurvedArrow(start_point=counter_2_rec.get_top(), end_point=second_group_rec_2.get_bottom(), angle=0, color=WHITE)
-            counter_2_group_arrow.tip.height = 0.3
+            counter_2_group_arrow = self.make_arrow(counter_2_rec.get_top(), second_group_rec_2.get_bottom(), 0)
             counter_2.add(counter_2_group_arrow)
-            counter_1_group_arrow = CurvedArrow(start_point=counter_1_rec.get_top(), end_point=second_group_rec_2.get_critical_point(DR)+UP*0.1+LEFT*0.1, angle=PI/2, color=WHITE)
-            counter_1_group_arrow.tip.height = 0.3
+            counter_1_group_arrow = self.make_arrow(counter_1_rec.get_top(), second_group_rec_2.get_critical_point(DR)+UP*0.1+LEFT*0.1, PI/2)
             counter_1.add(counter_1_group_arrow)
 
             self.play(
@@ -505,18 +528,15 @@ class CreateFrequent(VoiceoverScene):
             self.wait(6)
             self.play(ReplacementTransform(ball_4, ball_1))
             
-            third_group_text = MathTex(r"\text{Diff}=1")
-            third_group_rec = SurroundingRectangle(third_group_text, corner_radius=0.5, buff=0.5, color=WHITE)
-            third_group = VGroup(third_group_text, third_group_rec).scale(0.8)
+            third_group = self.make_group(r"\text{Diff}=1")
+            third_group_rec = third_group[1]
             third_group.shift(RIGHT*2)
             third_group.add(counter_1)
             counter_1.remove(counter_1_prev_arrow, counter_1_group_arrow)
             counter_1.next_to(third_group_rec, DOWN*3)
-            counter_1_group_arrow = CurvedArrow(start_point=counter_1_rec.get_top(), end_point=third_group_rec.get_bottom(), angle=PI/2, color=WHITE)
-            counter_1_group_arrow.tip.height = 0.3
+            counter_1_group_arrow = self.make_arrow(counter_1_rec.get_top(), third_group_rec.get_bottom(), PI/2)
             counter_1.add(counter_1_group_arrow)
-            third_group_arrow_down = CurvedArrow(start_point=third_group_rec.get_bottom(), end_point=counter_1_rec.get_top(), angle=PI/2, color=WHITE)
-            third_group_arrow_down.tip.height = 0.3
+            third_group_arrow_down = self.make_arrow(third_group_rec.get_bottom(), counter_1_rec.get_top(), PI/2)
             third_group.add(third_group_arrow_down)
             second_group_2.remove(counter_1)
             
@@ -535,26 +555,21 @@ class CreateFrequent(VoiceoverScene):
 
             # counter_2.shift(LEFT*0.5)
             counter_2.remove(counter_2_next_arrow, counter_2_group_arrow)
-            counter_2_group_arrow = CurvedArrow(start_point=counter_2_rec.get_top(), end_point=second_group_rec_2.get_bottom(), angle=0, color=WHITE)
-            counter_2_group_arrow.tip.height = 0.3
+            counter_2_group_arrow = self.make_arrow(counter_2_rec.get_top(), second_group_rec_2.get_bottom(), 0)
             counter_2.add(counter_2_group_arrow)
             # counter_3.shift(LEFT*0.5)
             counter_3.remove(counter_3_group_arrow)
-            counter_3_group_arrow = CurvedArrow(start_point=counter_3_rec.get_top(), end_point=second_group_rec_2.get_bottom(), angle=PI/4, color=WHITE)
-            counter_3_group_arrow.tip.height = 0.3
+            counter_3_group_arrow = self.make_arrow(counter_3_rec.get_top(), second_group_rec_2.get_bottom(), PI/4)
             counter_3.add(counter_3_group_arrow)
 
             second_group_2.remove(second_group_2_arrow_down)
-            second_group_2_arrow_down = CurvedArrow(start_point=second_group_rec_2.get_bottom(), end_point=counter_3_rec.get_top(), angle=PI/4, color=WHITE)
-            second_group_2_arrow_down.tip.height = 0.3
+            second_group_2_arrow_down = self.make_arrow(second_group_rec_2.get_bottom(), counter_3_rec.get_top(), PI/4)
             second_group_2.add(second_group_2_arrow_down)
 
-            second_group_2_next_arrow = CurvedArrow(start_point=second_group_rec_2.get_right(), end_point=third_group_rec.get_left(), angle=-PI/2, color=WHITE)
-            second_group_2_next_arrow.tip.height = 0.3
+            second_group_2_next_arrow = self.make_arrow(second_group_rec_2.get_right(), third_group_rec.get_left(), -PI/2)
             second_group_2.add(second_group_2_next_arrow)
 
-            third_group_prev_arrow = CurvedArrow(start_point=third_group_rec.get_left(), end_point=second_group_rec_2.get_right(), angle=-PI/2, color=WHITE)
-            third_group_prev_arrow.tip.height = 0.3
+            third_group_prev_arrow = self.make_arrow(third_group_rec.get_left(), second_group_rec_2.get_right(), -PI/2)
             third_group.add(third_group_prev_arrow)
 
             self.play(
@@ -571,9 +586,7 @@ class CreateFrequent(VoiceoverScene):
             self.wait(6)
             self.play(ReplacementTransform(ball_5, ball_1))
             
-            third_group_2_text = MathTex(r"\text{Diff}=2")
-            third_group_2_rec = SurroundingRectangle(third_group_2_text, corner_radius=0.5, buff=0.5, color=WHITE)
-            third_group_2 = VGroup(third_group_2_text, third_group_2_rec).scale(0.8)
+            third_group_2 = self.make_group(r"\text{Diff}=2")
             third_group_2.move_to(third_group_rec)
             third_group_2.add(counter_1, third_group_arrow_down, third_group_prev_arrow)
             self.play(
@@ -587,18 +600,16 @@ class CreateFrequent(VoiceoverScene):
             self.wait(4)
             self.play(ReplacementTransform(ball_6, ball_2))
             
-            third_group_3_text = MathTex(r"\text{Diff}=1")
-            third_group_3_rec = SurroundingRectangle(third_group_3_text, corner_radius=0.5, buff=0.5, color=WHITE)
-            third_group_3 = VGroup(third_group_3_text, third_group_3_rec).scale(0.8)
+            third_group_3 = self.make_group(r"\text{Diff}=1")
+            third_group_3_rec = third_group_3[1]
             third_group_3.move_to(third_group_rec)
             third_group_3.add(counter_1, third_group_arrow_down, third_group_prev_arrow)
             self.play(
                 ReplacementTransform(third_group_2, third_group_3)
             )
 
-            between_group_text = MathTex(r"\text{Diff}=1")
-            between_group_rec = SurroundingRectangle(between_group_text, corner_radius=0.5, buff=0.5, color=WHITE)
-            between_group = VGroup(between_group_text, between_group_rec).scale(0.8)
+            between_group = self.make_group(r"\text{Diff}=1")
+            between_group_rec = between_group[1]
             second_group_2.remove(counter_2)
             self.play(
                 Uncreate(second_group_2_next_arrow),
@@ -626,31 +637,23 @@ class CreateFrequent(VoiceoverScene):
                 counter_2.animate.next_to(between_group_rec,DOWN*3)
             )
 
-            second_group_2_arrow_down = CurvedArrow(start_point=second_group_rec_2.get_bottom(), end_point=counter_3_rec.get_top(), angle=PI/2, color=WHITE)
-            second_group_2_arrow_down.tip.height = 0.3
+            second_group_2_arrow_down = self.make_arrow(second_group_rec_2.get_bottom(), counter_3_rec.get_top(), PI/2)
             second_group_2.add(second_group_2_arrow_down)
-            counter_3_group_arrow = CurvedArrow(start_point=counter_3_rec.get_top(), end_point=second_group_rec_2.get_bottom(), angle=PI/2, color=WHITE)
-            counter_3_group_arrow.tip.height = 0.3
+            counter_3_group_arrow = self.make_arrow(counter_3_rec.get_top(), second_group_rec_2.get_bottom(), PI/2)
             counter_3.add(counter_3_group_arrow)
 
-            between_group_arrow_down = CurvedArrow(start_point=between_group_rec.get_bottom(), end_point=counter_2_rec.get_top(), angle=PI/2, color=WHITE)
-            between_group_arrow_down.tip.height = 0.3
+            between_group_arrow_down = self.make_arrow(between_group_rec.get_bottom(), counter_2_rec.get_top(), PI/2)
             between_group.add(between_group_arrow_down)
-            counter_2_group_arrow = CurvedArrow(start_point=counter_2_rec.get_top(), end_point=between_group_rec.get_bottom(), angle=PI/2, color=WHITE)
-            counter_2_group_arrow.tip.height = 0.3
+            counter_2_group_arrow = self.make_arrow(counter_2_rec.get_top(), between_group_rec.get_bottom(), PI/2)
             counter_2.add(counter_2_group_arrow)
 
-            second_group_2_next_arrow = CurvedArrow(start_point=second_group_rec_2.get_right(), end_point=between_group_rec.get_left(), angle=-PI/2, color=WHITE)
-            second_group_2_next_arrow.tip.height = 0.3
+            second_group_2_next_arrow = self.make_arrow(second_group_rec_2.get_right(), between_group_rec.get_left(), -PI/2)
             second_group_2.add(second_group_2_next_arrow)
-            between_group_prev_arrow = CurvedArrow(start_point=between_group_rec.get_left(), end_point=second_group_rec_2.get_right(), angle=-PI/2, color=WHITE)
-            between_group_prev_arrow.tip.height = 0.3
+            between_group_prev_arrow = self.make_arrow(between_group_rec.get_left(), second_group_rec_2.get_right(), -PI/2)
             between_group.add(between_group_prev_arrow)
-            between_group_next_arrow = CurvedArrow(start_point=between_group_rec.get_right(), end_point=third_group_3_rec.get_left(), angle=-PI/2, color=WHITE)
-            between_group_next_arrow.tip.height = 0.3
+            between_group_next_arrow = self.make_arrow(between_group_rec.get_right(), third_group_3_rec.get_left(), -PI/2)
             between_group.add(between_group_next_arrow)
-            third_group_3_prev_arrow = CurvedArrow(start_point=third_group_3_rec.get_left(), end_point=between_group_rec.get_right(), angle=-PI/2, color=WHITE)
-            third_group_3_prev_arrow.tip.height = 0.3
+            third_group_3_prev_arrow = self.make_arrow(third_group_3_rec.get_left(), between_group_rec.get_right(), -PI/2)
             third_group_3.add(third_group_3_prev_arrow)
 
             self.play(
@@ -669,16 +672,14 @@ class CreateFrequent(VoiceoverScene):
             # seventh ball into counter
             ball_7 = self.make_stream_ball_2(STREAM[6])
             self.wait(6)
-            second_group_3_text = MathTex(r"\text{Value}=0")
-            second_group_3_rec = SurroundingRectangle(second_group_3_text, corner_radius=0.5, buff=0.5, color=WHITE)
-            second_group_3 = VGroup(second_group_3_text, second_group_3_rec).scale(0.8)
+            second_group_3 = self.make_group(r"\text{Value}=0")
+            second_group_3_rec = second_group_3[1]
             second_group_3.move_to(second_group_rec_2)
             second_group_2.remove(counter_3, second_group_2_arrow_down, second_group_2_next_arrow)
             # second_group_3.add(counter_3, second_group_2_arrow_down, second_group_2_next_arrow)
 
-            last_cross = Cross(scale_factor=0.4)
-            last_rec = SurroundingRectangle(last_cross, buff=0.2, color=WHITE)
-            last_counter = VGroup(last_cross, last_rec)
+            last_counter = self.make_counter()
+            last_cross = last_counter[0]
             last_counter.next_to(second_group_3_rec, DOWN*3)
             last_counter.add(counter_3_group_arrow)
 
@@ -706,46 +707,60 @@ class CreateFrequent(VoiceoverScene):
                 Uncreate(second_group_2_arrow_down)
             )
 
-            
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-        
-
-
-
-
-
+    def template(self, key, build):
+        """A copy of what ``build()`` returns, building it only the first time for ``key``."""
+        if key not in self.templates:
+            self.templates[key] = build()
+        return self.templates[key].copy()
+
+    def make_bucket(self):
+        def build():
+            bucket_right_line = Line(start=[1,-1,0], end=[1,1,0], stroke_width=8)
+            bucket_bottom_line = Line(start=[-1,-1,0], end=[1,-1,0], stroke_width=8)
+            bucket_left_line = Line(start=[-1,-1,0], end=[-1,1,0], stroke_width=8)
+            return VGroup(bucket_right_line, bucket_bottom_line, bucket_left_line).scale(0.7)
+        return self.template("bucket", build)
+
+    def make_counter(self):
+        """An empty counter: a cross in a box."""
+        def build():
+            cross = Cross(scale_factor=0.4)
+            return VGroup(cross, SurroundingRectangle(cross, buff=0.2, color=WHITE))
+        return self.template("counter", build)
+
+    def make_group(self, text):
+        """A group box labelled ``text``."""
+        def build():
+            label = MathTex(text)
+            return VGroup(label, SurroundingRectangle(label, corner_radius=0.5, buff=0.5, color=WHITE)).scale(0.8)
+        return self.template(("group", text), build)
+
+    def make_arrow(self, start, end, angle):
+        """A curved pointer from ``start`` to ``end``; arrows of the same shape are copies of one another."""
+        start, end = np.array(start, dtype=float), np.array(end, dtype=float)
+        def build():
+            arrow = CurvedArrow(start_point=start, end_point=end, angle=angle, color=WHITE)
+            arrow.tip.height = 0.3
+            return arrow
+        arrow = self.template(("arrow", angle, tuple(np.round(end - start, 6))), build)
+        return arrow.shift(start - arrow.get_start())
+
+    def drop(self, ball, x):
+        """Create a stream ball above the frame and drop it in, in a single play."""
+        ball.move_to([x,5,0])
+        ball.generate_target()
+        ball.target.move_to([x,3,0])
+        self.play(Succession(Create(ball), MoveToTarget(ball)))
+        return ball
 
+    def make_ball(self, color):
+        return self.template(("ball", color), lambda: Circle(radius=0.5, color=color, fill_opacity=1))
 
-    def make_bucket(_):
-        bucket_right_line = Line(start=[1,-1,0], end=[1,1,0], stroke_width=8)
-        bucket_bottom_line = Line(start=[-1,-1,0], end=[1,-1,0], stroke_width=8)
-        bucket_left_line = Line(start=[-1,-1,0], end=[-1,1,0], stroke_width=8)
-        return VGroup(bucket_right_line, bucket_bottom_line, bucket_left_line).scale(0.7)
-    
     def make_stream_item(self, color):
-        ball = Circle(radius=0.5, color=color, fill_opacity=1)
-        ball.move_to([BUCKET_X[2],5,0])
-        ball.generate_target()
-        ball.target.move_to([BUCKET_X[2],3,0])
-        self.play(Create(ball))
-        self.play(MoveToTarget(ball))
-        return ball
-    
+        return self.drop(self.make_ball(color), BUCKET_X[2])
+
     def make_stream_group(self):
-        return VGroup(*[Circle(radius=0.5, color=item_color, fill_opacity=1) for item_color in STREAM])
+        return VGroup(*[self.make_ball(item_color) for item_color in STREAM])
     
     def contradiction_arrow(self):
         diag1 = Line(start=[1,1,0], end=[-1,-1,0], stroke_width=8)
@@ -755,10 +770,39 @@ class CreateFrequent(VoiceoverScene):
         return VGroup(diag1, horiz, diag2, arrow).set_color(RED).shift(UP*0.5)
     
     def make_stream_ball_2(self,color):
-        ball = Circle(radius=0.5, color=color, fill_opacity=1)
-        ball.move_to([0,5,0])
-        ball.generate_target()
-        ball.target.move_to([0,3,0])
-        self.play(Create(ball))
-        self.play(MoveToTarget(ball))
-        return ball
+        return self.drop(self.make_ball(color), 0)
+
+
+class Section(FrequentScene):
+    """One section of the video as a scene of its own."""
+    section = None
+
+    def construct(self):
+        getattr(self, self.section)()
+
+class Intro(Section):
+    section = "intro"
+
+class Buckets(Section):
+    section = "buckets"
+
+class Proof(Section):
+    section = "proof"
+
+class GroupedCounters(Section):
+    section = "grouped_counters"
+
+# Each section starts and ends on an empty screen, so none of them depends on
+# objects created by another and each can be rendered on its own.
+SECTIONS = [Intro, Buckets, Proof, GroupedCounters]
+
+class CreateFrequent(FrequentScene):
+    """The whole video in one render, with a manim section per part."""
+    def construct(self):
+        if SECTION is not None and SECTION not in [scene.__name__ for scene in SECTIONS]:
+            raise ValueError("unknown section %r" % SECTION)
+        for scene in SECTIONS:
+            if SECTION is not None and scene.__name__ != SECTION:
+                continue
+            self.next_section(scene.__name__)
+            getattr(self, scene.section)()
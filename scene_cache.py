@@ -0,0 +1,150 @@
+"""Content-addressed disk cache for the expensive parts of rendering the scene.
+
+Compiled LaTeX (the SVG behind every Tex/MathTex) and synthesized voiceover
+audio are stored under a hash of everything that determines them, in one
+directory shared by every render and checkout. Entries are evicted least
+recently used first once the cache grows past its size limit.
+
+Set FREQUENT_CACHE to move the cache and FREQUENT_CACHE_MB to resize it.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("FREQUENT_CACHE", Path.home() / ".cache" / "frequent-scene"))
+CACHE_MB = int(os.environ.get("FREQUENT_CACHE_MB", 512))
+
+
+class DiskCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_MB << 20):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def path(self, key, suffix):
+        return self.root / key[:2] / (key + suffix)
+
+    def get(self, key, suffix):
+        path = self.path(key, suffix)
+        # The modification time doubles as the last-use time for eviction.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, suffix, source):
+        path = self.path(key, suffix)
+        path.parent.mkdir(exist_ok=True)
+        # One temporary name per process, so parallel renders never share one.
+        temporary = path.with_suffix("%s.%d.tmp" % (path.suffix, os.getpid()))
+        shutil.copyfile(source, temporary)
+        os.replace(temporary, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        # Other renders may be writing, replacing or evicting entries meanwhile:
+        # their temporary files are not entries, and anything may vanish.
+        entries = []
+        for entry in self.root.glob("*/*"):
+            if entry.suffix == ".tmp":
+                continue
+            try:
+                info = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((info.st_mtime, info.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda info: info[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def enable_tex_cache(cache=None):
+    """Route every Tex/MathTex compilation through the cache.
+
+    The compiled SVG only depends on the expression, its environment and the
+    template; font_size is applied by scaling the parsed SVG afterwards, so
+    it is deliberately not part of the key.
+    """
+    from manim.mobject.text import tex_mobject
+    from manim.utils import tex_file_writing
+
+    cache = cache or DiskCache()
+    compile_svg = tex_file_writing.tex_to_svg_file
+
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        template = tex_template.body if tex_template is not None else None
+        key = cache.key("tex", expression, environment, template)
+        hit = cache.get(key, ".svg")
+        if hit is not None:
+            return hit
+        return cache.put(key, ".svg", compile_svg(expression, environment=environment, tex_template=tex_template))
+
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+
+def _settings(service):
+    """The plain configuration values of a speech service (voice, lang, tld, ...)."""
+    settings = {}
+    for name, value in vars(service).items():
+        if name.startswith("_") or name == "cache_dir":
+            continue
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            continue
+        settings[name] = value
+    return settings
+
+
+def cached_speech_service(service, cache=None):
+    """Make a manim-voiceover speech service look up its audio in the cache first.
+
+    Audio is keyed by the service's class and configuration as well as the
+    text, so changing e.g. the GTTS ``lang`` or ``tld`` records anew. Hits
+    are copied into the service's own cache directory under the name the
+    service would have used, so the rest of manim-voiceover is unaffected;
+    neither the speech engine nor the recorder is started.
+    """
+    cache = cache or DiskCache()
+    generate = service.generate_from_text
+
+    def generate_from_text(text, cache_dir=None, path=None, **kwargs):
+        cache_dir = Path(cache_dir or service.cache_dir)
+        key = cache.key("voice", type(service).__name__, _settings(service), text, kwargs)
+        meta = cache.get(key, ".json")
+        if meta is not None:
+            result = json.loads(meta.read_text())
+            audio = cache.get(key, Path(result["original_audio"]).suffix)
+            if audio is not None:
+                if path is not None:
+                    result["original_audio"] = path
+                target = cache_dir / result["original_audio"]
+                if not target.exists():
+                    shutil.copyfile(audio, target)
+                return result
+        result = generate(text, cache_dir=str(cache_dir), path=path, **kwargs)
+        audio = cache_dir / result["original_audio"]
+        cache.put(key, audio.suffix, audio)
+        temporary = cache_dir / (key + ".json")
+        temporary.write_text(json.dumps(result))
+        cache.put(key, ".json", temporary)
+        temporary.unlink()
+        return result
+
+    service.generate_from_text = generate_from_text
+    return service
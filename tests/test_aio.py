@@ -0,0 +1,75 @@
+import asyncio
+from collections import Counter
+
+from frequent import AsyncFrequent, Frequent
+
+STREAM = [b"a", b"b", b"a", b"c", b"a", b"d", b"b", b"a"]
+
+
+def test_consume_queue_until_stop():
+    async def run():
+        queue = asyncio.Queue()
+        ingest = AsyncFrequent(k=2, batch_size=3)
+        for item in STREAM:
+            queue.put_nowait(item)
+        queue.put_nowait(None)
+        return ingest, await ingest.consume(queue)
+
+    ingest, count = asyncio.run(run())
+    assert count == len(STREAM)
+    assert ingest.summary.n == len(STREAM)
+    assert ingest.snapshot()[0] == (b"a", 2)
+
+
+def test_consume_async_iterator():
+    async def items():
+        for item in STREAM:
+            await asyncio.sleep(0)
+            yield item
+
+    ingest = AsyncFrequent(summary=Frequent(8), batch_size=3)
+    assert asyncio.run(ingest.consume(items())) == len(STREAM)
+    assert ingest.summary.counts() == Counter(STREAM)
+
+
+def test_consume_lines_from_tcp_stand_in():
+    async def run():
+        async def send(reader, writer):
+            # Chunks that cut lines in two, and a last line without a newline.
+            for chunk in (b"a\nb", b"\na\n\nc", b"\na"):
+                writer.write(chunk)
+                await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(send, "127.0.0.1", 0)
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            ingest = AsyncFrequent(k=8)
+            count = await ingest.consume_lines(reader)
+            writer.close()
+        return ingest, count
+
+    ingest, count = asyncio.run(run())
+    assert count == 5
+    assert ingest.summary.counts() == {b"a": 3, b"b": 1, b"c": 1}
+
+
+def test_serve_feeds_every_connection():
+    async def run():
+        ingest = AsyncFrequent(k=8, batch_size=2)
+        server = await ingest.serve()
+        address = server.sockets[0].getsockname()[:2]
+        for lines in (b"a\nb\na\n", b"c\na"):
+            reader, writer = await asyncio.open_connection(*address)
+            writer.write(lines)
+            writer.write_eof()
+            # The server closes the connection once it has ingested everything.
+            assert await reader.read() == b""
+            writer.close()
+        server.close()
+        await server.wait_closed()
+        return ingest
+
+    ingest = asyncio.run(run())
+    assert ingest.summary.counts() == {b"a": 3, b"b": 1, b"c": 1}
+    assert ingest.snapshot()[0] == (b"a", 3)
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from frequent.__main__ import main
+
+STREAM = ["alphabet", "alphabet", "alphabet", "a", "b", "c", "d"]
+
+
+def topk(capsys, tmp_path, *options):
+    path = tmp_path / "items.txt"
+    path.write_text("\n".join(STREAM) + "\n")
+    main(["topk", str(path)] + list(options))
+    lines = capsys.readouterr().out.splitlines()
+    return lines[0], [line.split("\t") for line in lines[1:]]
+
+
+@pytest.mark.parametrize("backend", ["frequent", "compact", "lazy"])
+@pytest.mark.parametrize("chunk_bytes", ["16", str(1 << 20)])
+def test_topk_text_bounds(capsys, tmp_path, backend, chunk_bytes):
+    header, rows = topk(capsys, tmp_path, "--k", "2", "--backend", backend, "--chunk-bytes", chunk_bytes)
+    assert header == "# n=7 k=2"
+    bounds = {item: (int(lower), int(upper)) for item, lower, upper in rows}
+    # alphabet occurs 3 > 7/3 times, so it must be reported and bracketed.
+    lower, upper = bounds["alphabet"]
+    assert lower <= 3 <= upper
+    for item, (lower, upper) in bounds.items():
+        assert lower <= STREAM.count(item) <= upper
+
+
+def test_topk_verify(capsys, tmp_path):
+    header, rows = topk(capsys, tmp_path, "--k", "2", "--verify")
+    assert header == "# n=7 k=2 verified"
+    assert rows == [["alphabet", "3"]]
+
+
+def test_topk_int_backend_rejects_text(capsys, tmp_path):
+    with pytest.raises(SystemExit):
+        topk(capsys, tmp_path, "--k", "2", "--backend", "int")
+
+
+def test_bench_reports_bytes_per_counter(capsys, tmp_path):
+    path = tmp_path / "results.json"
+    main(["bench", "--n", "2000", "--k", "10", "--streams", "zipf", "--backends", "frequent", "compact",
+          "--latency-samples", "100", "--memory-items", "1000", "--json", str(path)])
+    header, *rows = capsys.readouterr().out.splitlines()
+    assert "B/counter" in header.split()
+    assert len(rows) == 2
+    results = json.loads(path.read_text())["results"]
+    assert all(row["bytes_per_counter"] > 0 for row in results)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from frequent import CompactFrequent, Frequent
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+def test_update_batch_keeps_longer_candidates(factory):
+    summary = factory(3)
+    summary.update_batch(np.array(["alphabet", "alphabet", "zz"]))
+    summary.update_batch(np.array(["a", "b"]))
+    assert summary.counts() == {"alphabet": 1}
+    summary = factory(3)
+    summary.update_batch(np.array([b"alphabet"]))
+    summary.update_batch(np.array([b"a"]))
+    assert summary.counts() == {b"alphabet": 1, b"a": 1}
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+def test_update_batch_keeps_wider_int_candidates(factory):
+    summary = factory(3)
+    summary.update_batch(np.array([1 << 40], dtype=np.int64))
+    summary.update_batch(np.array([1, 2], dtype=np.int32))
+    assert summary.counts() == {1 << 40: 1, 1: 1, 2: 1}
+
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+def test_update_batch_never_converts_candidates(factory):
+    # k=1 with three distinct items applies the batch in bulk, against the
+    # candidates of another dtype.
+    summary = factory(1)
+    summary.update_batch(np.array([(1 << 53) + 1] * 3, dtype=np.int64))
+    summary.update_batch(np.array([5, 5, 6, 7], dtype=np.uint64))
+    assert summary.counts() == {(1 << 53) + 1: 1}
+    assert type(summary.top(1)[0][0]) is int
+    summary = factory(1)
+    summary.update(7, 5)
+    summary.update_batch(np.array(["7", "8", "9"]))
+    assert summary.counts() == {7: 4}
+    summary = factory(1)
+    summary.update("x", 5)
+    summary.update_batch(np.array([1, 1, 1, 1, 1, 1, 2, 3]))
+    assert summary.counts() == {1: 1}
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+def test_small_update_batch_keeps_items_apart(factory):
+    # Few distinct items go through update one by one.
+    summary = factory(8)
+    summary.update(7, 5)
+    summary.update_batch(np.array(["7"]))
+    summary.update_batch(np.array([(1 << 53) + 1, 5], dtype=np.uint64))
+    assert summary.counts() == {7: 5, "7": 1, (1 << 53) + 1: 1, 5: 1}
+    assert all(type(item) is not float for item in summary.counts())
+
+def test_trace_and_instrument_exclude_each_other():
+    summary = Frequent(2)
+    metrics = summary.instrument()
+    with pytest.raises(RuntimeError):
+        summary.trace()
+    summary.untrace()
+    summary.extend("abcab")
+    assert metrics.as_dict(summary)["updates"] == 5
+    summary.uninstrument()
+    trace = summary.trace()
+    with pytest.raises(RuntimeError):
+        summary.instrument()
+    summary.uninstrument()
+    summary.update("a")
+    assert trace.events[-1][0] != "layout"
+    summary.untrace()
+    assert "update" not in vars(summary)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from frequent import HierarchicalFrequent, IPv4, Paths
+
+
+def test_paths_levels_keep_their_prefixes():
+    summary = HierarchicalFrequent(3, Paths(3))
+    summary.update_batch(["/api/users/42"] * 5)
+    summary.update_batch(["/a"])
+    assert [level.counts() for level in summary.summaries] == [
+        {"/api/users/42": 5, "/a": 1},
+        {"/api/users": 5, "/a": 1},
+        {"/api": 5, "/a": 1},
+    ]
+
+
+def test_paths_generalize():
+    paths = Paths(3)
+    items = ["/api/users/42", "/a", "", "/x/y/z/w"]
+    assert paths.generalize(items, 0).tolist() == ["/api/users/42", "/a", "/", "/x/y/z"]
+    assert paths.generalize(items, 2).tolist() == ["/api", "/a", "/", "/x"]
+    assert [level.tolist() for level in paths.prefixes(items)] == [paths.generalize(items, level).tolist() for level in range(3)]
+
+
+def test_subnet_is_heavy_without_a_heavy_address():
+    rng = np.random.default_rng(0)
+    subnet = (10 << 24) | (1 << 16) | (2 << 8)
+    address = (192 << 24) | (168 << 16) | 5
+    stream = np.concatenate([subnet + rng.integers(0, 256, 3000), np.full(2000, address), rng.integers(0, 1 << 32, 5000)])
+    rng.shuffle(stream)
+    summary = HierarchicalFrequent(50, IPv4())
+    summary.update_batch(stream)
+    heavy = {label: discounted for label, _, _, discounted in summary.hhh(1000)}
+    assert set(heavy) == {"10.1.2.0/24", "192.168.0.5/32"}
+    # The address's /24 is not reported again: its traffic is already explained.
+    assert "192.168.0.0/24" not in heavy
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from frequent import CompactFrequent, Frequent
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+def test_counters_follow_each_branch(factory):
+    summary = factory(2)
+    timings = []
+    metrics = summary.instrument(sample_every=2, callback=timings.append)
+    expected = dict.fromkeys(metrics.FIELDS, 0)
+
+    def step(item, **changes):
+        summary.update(item)
+        expected["updates"] += 1
+        for field, change in changes.items():
+            expected[field] += change
+        assert {field: getattr(metrics, field) for field in metrics.FIELDS} == expected
+
+    # a takes an empty counter, moving to a new group of value 1.
+    step("a", inserts=1, splits=1)
+    # a moves on to a new group of value 2 and leaves its old group empty.
+    step("a", hits=1, splits=1, merges=1)
+    # b takes the last empty counter and the zero group disappears.
+    step("b", inserts=1, splits=1, merges=1)
+    # c finds both counters in use: one decrement, b drops to zero.
+    step("c", decrements=1)
+    step("a", hits=1, splits=1, merges=1)
+    assert summary.counts() == {"a": 2}
+
+    # Every second update is timed, into the ring buffer and the callback.
+    assert len(timings) == 2 and list(metrics.timings) == timings
+    assert all(elapsed >= 0 for elapsed in timings)
+
+    shape = metrics.as_dict(summary)
+    assert shape["groups"] == 2 and shape["zero_group"] == 1
+    assert shape["timings_ns"] == timings
+
+    # A batch of few distinct items is one update each; a larger one and a
+    # merge rebuild the groups.
+    summary.update_batch(np.array(["a"]))
+    assert (metrics.updates, metrics.hits, metrics.rebuilds) == (6, 3, 0)
+    summary.update_batch(np.array(list("defgh")))
+    assert metrics.rebuilds == 1
+    other = factory(2)
+    other.extend("xy")
+    summary.merge(other)
+    assert metrics.rebuilds == 2 and metrics.updates == 6
+
+    metrics.reset()
+    assert metrics.updates == 0 and not metrics.timings
+    summary.uninstrument()
+    summary.update("a")
+    assert metrics.updates == 0
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from frequent import CompactFrequent, Frequent
+
+K = 8
+
+
+def fed(factory, seed=0):
+    summary = factory(K)
+    for batch in np.random.default_rng(seed).zipf(1.3, (4, 300)) % 40:
+        summary.update_batch(batch)
+    summary.extend([1, 2, 1])
+    return summary
+
+
+def by_count(pairs):
+    """The counts of ``pairs`` in order, and the items of each count."""
+    groups = {}
+    for item, count in pairs:
+        groups.setdefault(count, set()).add(item)
+    return [count for _, count in pairs], groups
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+@pytest.mark.parametrize("seed", range(3))
+def test_top_and_above_match_sorted_counts(factory, seed):
+    summary = fed(factory, seed)
+    ranked = sorted(summary.counts().items(), key=lambda pair: -pair[1])
+    values, items = by_count(ranked)
+    for m in range(K + 2):
+        top = summary.top(m)
+        top_values, top_items = by_count(top)
+        assert top_values == values[:m]
+        # Ties may come in any order, but only with the right count.
+        for count, tied in top_items.items():
+            assert tied <= items[count]
+    for threshold in [-1, 0] + sorted(set(values)):
+        above = summary.above(threshold)
+        assert [count for _, count in above] == sorted((count for count in values if count > threshold), reverse=True)
+        assert {item for item, _ in above} == {item for item, count in ranked if count > threshold}
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+def test_snapshot_is_cached_until_the_next_update(factory):
+    summary = fed(factory)
+    snapshot = summary.snapshot()
+    assert isinstance(snapshot, tuple)
+    assert snapshot == tuple(summary.top(K))
+    assert summary.snapshot() is snapshot
+    summary.update(39)
+    fresh = summary.snapshot()
+    assert fresh is not snapshot and fresh == tuple(summary.top(K))
+    other = fed(factory, 1)
+    summary.merge(other)
+    assert summary.snapshot() is not fresh
+    assert summary.snapshot() == tuple(summary.top(K))
+    empty = factory(K)
+    assert empty.snapshot() == () and empty.top(3) == [] and empty.above(0) == []
@@ -0,0 +1,70 @@
+import threading
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from frequent import CompactFrequent, Frequent, ShardedFrequent
+
+K = 5
+
+
+def zipf_stream(seed, size=8000):
+    return (np.random.default_rng(seed).zipf(1.3, size) % 60).astype(np.int64)
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent])
+def test_threaded_ingestion_keeps_bounds(factory):
+    stream = zipf_stream(0)
+    sharded = ShardedFrequent(K, shards=4, factory=factory)
+    parts = np.array_split(stream, 8)
+
+    def feed(index, part):
+        # Every way in, from several threads at once.
+        if index % 3 == 0:
+            for item in part.tolist():
+                sharded.update(item)
+        elif index % 3 == 1:
+            sharded.extend(part.tolist())
+        else:
+            for batch in np.array_split(part, 4):
+                sharded.update_batch(batch)
+
+    threads = [threading.Thread(target=feed, args=(index, part)) for index, part in enumerate(parts)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    exact = Counter(stream.tolist())
+    n = len(stream)
+    assert sharded.n == n
+    merged = sharded.summary()
+    assert merged.n == n and len(merged) <= K
+    for item in range(60):
+        for lower, upper in (sharded.estimate(item), merged.estimate(item)):
+            assert lower <= exact[item] <= upper
+        if exact[item] * (K + 1) > n:
+            assert item in merged
+    assert sharded.top(2) == merged.top(2)
+
+
+def test_summary_is_cached_until_a_shard_changes():
+    sharded = ShardedFrequent(K, shards=3)
+    sharded.extend("abracadabra")
+    merged = sharded.summary()
+    assert sharded.summary() is merged
+    assert sharded.snapshot() == merged.snapshot()
+    sharded.update("a")
+    assert sharded.summary() is not merged
+    assert sharded.counts()["a"] == 6
+
+
+def test_update_batch_weights():
+    weighted, repeated = ShardedFrequent(K, shards=4), ShardedFrequent(K, shards=4)
+    items = np.array([3, 1, 3, 7, 2])
+    weights = np.array([2, 5, 1, 0, 4])
+    weighted.update_batch(items, weights)
+    repeated.update_batch(np.repeat(items, weights))
+    assert weighted.n == repeated.n == 12
+    assert weighted.counts() == repeated.counts() == {3: 3, 1: 5, 2: 4}
@@ -0,0 +1,124 @@
+import pickle
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from frequent import CompactFrequent, Frequent, IntFrequent, LazyFrequent, LossyCounting, SpaceSaving
+
+K = 5
+
+# name -> factory taking the k of Frequent; Space-Saving needs k+1 counters for the same guarantee.
+BACKENDS = {
+    "frequent": Frequent,
+    "compact": CompactFrequent,
+    "lazy": LazyFrequent,
+    "int": IntFrequent,
+    "space-saving": lambda k: SpaceSaving(k + 1),
+    "lossy": LossyCounting,
+}
+CHECKPOINTED = [Frequent, CompactFrequent, IntFrequent]
+
+
+def misra_gries(pairs, k):
+    """The textbook weighted algorithm: decrement everything while a new item finds no free counter."""
+    counters = {}
+    decrements = 0
+    for item, weight in pairs:
+        if item in counters:
+            counters[item] += weight
+            continue
+        while weight and len(counters) == k:
+            cut = min(weight, min(counters.values()))
+            for other in list(counters):
+                counters[other] -= cut
+                if not counters[other]:
+                    del counters[other]
+            decrements += cut
+            weight -= cut
+        if weight:
+            counters[item] = weight
+    return counters, decrements
+
+
+def weighted_pairs(seed, size=400):
+    rng = random.Random(seed)
+    return [(rng.randint(0, 12), rng.choice([1, 1, 1, rng.randint(1, 9)])) for _ in range(size)]
+
+
+def zipf_batches(seed, batches=6, size=500):
+    rng = np.random.default_rng(seed)
+    return [rng.zipf(1.4, size) % 60 for _ in range(batches)]
+
+
+def check_bounds(summary, stream, k):
+    exact = Counter(stream.tolist())
+    n = len(stream)
+    assert summary.n == n
+    for item in range(60):
+        lower, upper = summary.estimate(item)
+        assert lower <= exact[item] <= upper
+        if exact[item] * (k + 1) > n:
+            assert item in summary
+
+
+@pytest.mark.parametrize("factory", [Frequent, CompactFrequent, LazyFrequent])
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_naive_weighted_misra_gries(factory, seed):
+    k = 1 + seed % 6
+    summary = factory(k)
+    pairs = weighted_pairs(seed)
+    for step, (item, weight) in enumerate(pairs):
+        summary.update(item, weight)
+        if step % 50 == 0:
+            assert (summary.counts(), summary.decrements) == misra_gries(pairs[:step + 1], k)
+    assert (summary.counts(), summary.decrements) == misra_gries(pairs, k)
+    assert summary.decrements * (k + 1) <= summary.n
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [K, 40])
+def test_bounds_after_update_batch(name, seed, k):
+    summary = BACKENDS[name](k)
+    batches = zipf_batches(seed)
+    for batch in batches:
+        summary.update_batch(batch)
+    check_bounds(summary, np.concatenate(batches), k)
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+@pytest.mark.parametrize("seed", range(5))
+def test_bounds_after_merge(name, seed):
+    batches = zipf_batches(seed)
+    left, right = BACKENDS[name](K), BACKENDS[name](K)
+    for batch in batches[:3]:
+        left.update_batch(batch)
+    for batch in batches[3:]:
+        right.extend(batch.tolist())
+    assert left.merge(right) is left
+    check_bounds(left, np.concatenate(batches), K)
+
+
+@pytest.mark.parametrize("factory", CHECKPOINTED)
+def test_dump_load_round_trip(factory):
+    summary = factory(K)
+    for batch in zipf_batches(1):
+        summary.update_batch(batch)
+    restored = factory.load(summary.dump())
+    assert (restored.k, restored.n, restored.decrements) == (summary.k, summary.n, summary.decrements)
+    assert restored.counts() == summary.counts()
+    restored.update_batch(zipf_batches(2)[0])
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_pickle_round_trip(name):
+    summary = BACKENDS[name](K)
+    for batch in zipf_batches(3):
+        summary.update_batch(batch)
+    restored = pickle.loads(pickle.dumps(summary))
+    assert (restored.n, restored.decrements) == (summary.n, summary.decrements)
+    assert restored.counts() == summary.counts()
+    for item in range(60):
+        assert restored.estimate(item) == summary.estimate(item)
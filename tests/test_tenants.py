@@ -0,0 +1,79 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from frequent import IntFrequent, MultiFrequent
+from frequent.tenants import COUNTER_BYTES
+
+
+def test_single_tenant_bounds_match_int_frequent():
+    rng = np.random.default_rng(0)
+    summary = MultiFrequent(64 * COUNTER_BYTES)
+    batches = [rng.zipf(1.3, 2000) % 500 for _ in range(10)]
+    for batch in batches:
+        summary.update_batch(np.zeros(len(batch), dtype=np.int64), batch)
+    reference = IntFrequent(summary.k(0))
+    for batch in batches:
+        reference.update_batch(batch)
+    exact = Counter(np.concatenate(batches).tolist())
+    for item, count in exact.items():
+        lower, upper = summary.estimate(0, item)
+        assert lower <= count <= upper
+        if count * (summary.k(0) + 1) > summary.n(0):
+            assert summary.count(0, item) > 0
+
+
+def test_many_tenants_stay_within_bounds_and_budget():
+    rng = np.random.default_rng(1)
+    summary = MultiFrequent(4000 * COUNTER_BYTES, min_k=4)
+    exact = Counter()
+    for _ in range(30):
+        tenants = (rng.zipf(1.5, 3000) - 1) % 300
+        items = rng.zipf(1.2, 3000) % 2000
+        summary.update_batch(tenants, items)
+        exact.update(zip(tenants.tolist(), items.tolist()))
+    for step in range(500):
+        summary.update(step % 7, step % 13)
+        exact[(step % 7, step % 13)] += 1
+    assert sum(summary.k(tenant) for tenant in summary.tenants()) <= summary.capacity
+    for (tenant, item), count in exact.items():
+        lower, upper = summary.estimate(tenant, item)
+        assert lower <= count <= upper
+    for tenant in summary.tenants():
+        assert len(summary.counts(tenant)) <= summary.k(tenant)
+        assert summary.n(tenant) == sum(count for (owner, _), count in exact.items() if owner == tenant)
+
+
+def test_too_many_tenants_leaves_the_state_alone():
+    summary = MultiFrequent(10 * COUNTER_BYTES, min_k=4)
+    summary.update_batch([0, 1], [1, 2])
+    before = summary.tenants(), summary.n(0), summary.counts(0), len(summary)
+    with pytest.raises(MemoryError):
+        summary.update_batch([0, 2], [5, 6])
+    assert (summary.tenants(), summary.n(0), summary.counts(0), len(summary)) == before
+
+
+def test_sparse_tenant_ids_take_dense_slots():
+    summary = MultiFrequent(64 * COUNTER_BYTES, min_k=4)
+    summary.update_batch([10 ** 9, 10 ** 9, 3], [1, 1, 2])
+    summary.update(10 ** 12, 5)
+    assert summary.tenants() == [3, 10 ** 9, 10 ** 12]
+    assert summary.counts(10 ** 9) == {1: 2}
+    assert summary.counts(10 ** 12) == {5: 1}
+    assert summary.n(7) == 0 and summary.counts(7) == {}
+    assert len(summary._n) <= 4
+
+
+def test_buffered_update_checks_tenant_and_budget_at_once():
+    summary = MultiFrequent(4 * COUNTER_BYTES, min_k=2)
+    summary.update(0, 1)
+    summary.update(1, 2)
+    with pytest.raises(ValueError):
+        summary.update(-1, 3)
+    with pytest.raises(MemoryError):
+        summary.update(2, 3)
+    summary.update(1, 2)
+    assert summary.tenants() == [0, 1]
+    assert summary.counts(1) == {2: 2}
+    assert summary.n(0) == 1
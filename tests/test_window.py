@@ -0,0 +1,80 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from frequent import DecayedFrequent, WindowedFrequent
+
+K = 5
+
+
+def zipf_stream(seed, size=3000):
+    return (np.random.default_rng(seed).zipf(1.3, size) % 40).tolist()
+
+
+def check_window(summary, recent, n, k):
+    """The bounds of the module docstring; ``recent`` are the items in the blocks, the last ``n`` in the window."""
+    assert summary.n == len(recent)
+    exact = Counter(recent[len(recent) - n:])
+    expired = Counter(recent[:len(recent) - n])
+    for item in range(40):
+        count = summary.count(item)
+        assert exact[item] - len(recent) / (k + 1) <= count <= exact[item] + expired[item]
+        if exact[item] * (k + 1) > len(recent):
+            assert item in summary
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_count_window_bounds(seed):
+    stream = zipf_stream(seed)
+    windowed = WindowedFrequent(K, window=400, blocks=4)
+    for position, item in enumerate(stream, 1):
+        windowed.update(item)
+        if position % 170 == 0:
+            summary = windowed.summary()
+            if position >= 400:
+                # The window and at most one block of 100 items before it.
+                assert 400 <= summary.n < 500
+            check_window(summary, stream[position - summary.n:position], min(position, 400), K)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_clock_window_bounds(seed):
+    rng = np.random.default_rng(seed)
+    now = [0]
+    windowed = WindowedFrequent(K, window=50, blocks=5, clock=lambda: now[0])
+    times, items = [], []
+    for item in zipf_stream(seed):
+        now[0] += int(rng.integers(0, 2))
+        windowed.update(item)
+        times.append(now[0])
+        items.append(item)
+        if len(items) % 170 == 0:
+            summary = windowed.summary()
+            n = sum(1 for time in times if time >= now[0] - 50)
+            assert n <= summary.n < n + sum(1 for time in times if now[0] - 60 <= time < now[0] - 50) + 1
+            check_window(summary, items[len(items) - summary.n:], n, K)
+
+
+def test_decayed_counts_bounds():
+    half_life, block = 200, 25
+    stream = zipf_stream(0, 2000)
+    decayed = DecayedFrequent(K, half_life, block=block)
+    decayed.extend(stream)
+    now = len(stream)
+    # What the summary weighs: each item by the age of the end of its block.
+    weighted, exact = Counter(), Counter()
+    for position, item in enumerate(stream):
+        age = max(now - (position // block + 1) * block, 0)
+        weighted[item] += 0.5 ** (age / half_life)
+        exact[item] += 0.5 ** ((now - position) / half_life)
+    total = sum(weighted.values())
+    counts = decayed.counts()
+    assert len(counts) <= K
+    for item in range(40):
+        assert exact[item] <= weighted[item] + 1e-9
+        assert weighted[item] <= exact[item] * 2 ** (block / half_life) + 1e-9
+        count = counts.get(item, 0)
+        assert weighted[item] - total / (K + 1) - 1e-9 <= count <= weighted[item] + 1e-9
+        if weighted[item] > total / (K + 1):
+            assert item in counts